@@ -1,14 +1,176 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import sqlite3
+import stat
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
-
-from PySide6.QtWidgets import QDialog, QMessageBox
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QDialog, QFileDialog, QMessageBox
+from src.app.dialogs.mssql_connection_dialog import MSSQLConnectionDialog
+from src.app.dialogs.schema_validation_dialog import SchemaValidationDialog, SchemaDeploymentProgressDialog
+from src.app.dialogs.settings_dialog import SettingsDialog
+from src.services.background_runner import run_bg
 from src.services.recent_projects import RecentProjectsService
 from src.services.logging_model import LoggingModel
 from src.services.project_creator_local import ProjectCreatorLocal
 from src.services.project_creator_remote import ProjectCreatorRemote
 from src.services.app_context import app_context
+from src.services.azure_ad_token_manager import ConnectionDescriptor, get_token_manager
+from src.services.mssql_connection import is_aad_0x534
+from src.services.net_probe import ensure_reachable, sql_server_endpoint
+from src.services.odbc_pool import load_pyodbc, test_connections
+from src.services.secure_credential_manager import get_credential_manager
+
+# Settings rows needed before a project can be opened, read in one query
+_REMOTE_SETTINGS_KEYS = (
+    'remote_server', 'remote_database', 'remote_auth_type',
+    'remote_username', 'remote_authority', 'remote_port',
+)
+_OPEN_SETTINGS_KEYS = ('storage_mode',) + _REMOTE_SETTINGS_KEYS
+# Fixed key set -> fixed SQL text, so SQLite's statement cache hits and no per-call join
+_OPEN_SETTINGS_SQL = "SELECT key, value FROM settings WHERE key IN ({})".format(
+    ",".join("?" * len(_OPEN_SETTINGS_KEYS))
+)
+# Remote-create writes; kept as constants so every call reuses the same statement text
+_UPSERT_SETTING_SQL = "INSERT OR REPLACE INTO settings(key, value) VALUES(?, ?)"
+_UPSERT_MSSQL_CONNECTION_SQL = (
+    "INSERT OR REPLACE INTO mssql_connection"
+    " (id, server, database, port, auth_type, username, password)"
+    " VALUES (1, ?, ?, ?, ?, ?, NULL)"
+)
+# Values of boolean project settings (e.g. 'ui_db_logging') that count as enabled
+_TRUTHY = frozenset({"1", "true", "on", "yes"})
+
+
+def _is_truthy(value) -> bool:
+    """Exact matches (the common stored '1'/'0') skip the str/strip/lower copies."""
+    if value in _TRUTHY:
+        return True
+    text = value if isinstance(value, str) else str(value)
+    return text.strip().lower() in _TRUTHY
+
+
+def _same_path(a, b) -> bool:
+    return os.path.normcase(os.path.abspath(a)) == os.path.normcase(os.path.abspath(b))
+
+
+# Internal auth_type -> MSSQLConnectionDialog combo text
+_AUTH_DISPLAY: Mapping[str, str] = MappingProxyType({
+    "sql": "MS-SQL",
+    "azure_ad_interactive": "Azure AD Interactive",
+    "azure_ad_integrated": "Azure AD Integrated",
+})
+
+# View capability flags; resolved once when a view is attached instead of per callback
+_HAS_START_BUSY = 1 << 0
+_HAS_STOP_BUSY = 1 << 1
+_HAS_IS_BUSY = 1 << 2
+_HAS_SHOW_RECENT = 1 << 3
+_HAS_ADD_RECENT = 1 << 4
+_HAS_REMOVE_RECENT = 1 << 5
+_HAS_OPEN_STATE = 1 << 6
+_HAS_APPEND_LOG = 1 << 7
+
+# Skip per-entry icon lookups and symlink resolution; both stat every file, which is
+# painfully slow on network or sshfs home directories
+_FILE_DIALOG_OPTIONS = QFileDialog.Option.DontUseCustomDirectoryIcons | QFileDialog.Option.DontResolveSymlinks
+
+_VIEW_CAPS = (
+    ("start_busy", _HAS_START_BUSY),
+    ("stop_busy", _HAS_STOP_BUSY),
+    ("is_busy", _HAS_IS_BUSY),
+    ("show_recent", _HAS_SHOW_RECENT),
+    ("add_recent_top", _HAS_ADD_RECENT),
+    ("remove_recent", _HAS_REMOVE_RECENT),
+    ("set_project_open_state", _HAS_OPEN_STATE),
+    ("append_log", _HAS_APPEND_LOG),
+)
+
+_pyodbc = None
+
+
+def _load_pyodbc():
+    """Import pyodbc once, on first use (only remote projects need the ODBC driver)."""
+    global _pyodbc
+    if _pyodbc is None:
+        # Driver-manager pooling: repeated connects with the same string reuse the session
+        _pyodbc = load_pyodbc()
+    return _pyodbc
+
+
+# Connection-test errors beyond this many characters are truncated in the message box
+_MAX_ERROR_DISPLAY_CHARS = 2048
+
+# auth_type -> (connection-string fragments, whether UID is sent); unknown types fall back to windows
+_AUTH_FRAGMENTS = {
+    "windows": (("Trusted_Connection=yes",), False),
+    "sql": ((), True),
+    "azure_ad_interactive": (("Authentication=ActiveDirectoryInteractive",), True),
+    "azure_ad_password": (("Authentication=ActiveDirectoryPassword",), True),
+    "azure_ad_integrated": (("Authentication=ActiveDirectoryIntegrated",), False),
+    "azure_ad_device_code": (("Authentication=ActiveDirectoryDeviceCode",), True),
+}
+
+# Dialog descriptor keys copied into a ConnectionDescriptor, with their defaults
+_CD_FIELDS = (
+    ("server", ""),
+    ("database", ""),
+    ("auth_type", "windows"),
+    ("username", None),
+    ("authority", None),
+)
+
+
+def _test_conn_key(descriptor: dict) -> tuple:
+    # Only the fields that shape the connection string (never the password) become cache keys
+    return (
+        descriptor.get("server"),
+        descriptor.get("database"),
+        descriptor.get("auth_type"),
+        descriptor.get("username"),
+        descriptor.get("authority"),
+    )
+
+
+def _test_conn_params(descriptor: dict, driver: str = "18") -> tuple[str, int]:
+    """Validate a test descriptor and return (connection string, timeout seconds)."""
+    key = _test_conn_key(descriptor)
+    if not key[0] or not key[1]:
+        raise ValueError("Server and Database are required")
+    timeout = descriptor.get("connect_timeout_seconds")
+    if timeout is None:
+        timeout = 30
+    return _build_test_conn_str(*key, driver), timeout
+
+
+@lru_cache(maxsize=128)
+def _build_test_conn_str(server, database, auth_type, username, authority, driver: str = "18") -> str:
+    """ODBC connection string for a connection test; pure, so results are memoized per driver.
+
+    Callers validate server/database first (see _test_conn_params), so incomplete
+    descriptors never reach the cache.
+    """
+    auth_type = (auth_type or "").lower()
+    is_aad = auth_type.startswith("azure_ad")
+    fragments, sends_uid = _AUTH_FRAGMENTS.get(auth_type, _AUTH_FRAGMENTS["windows"])
+
+    # Fixed-shape tuple; optional pieces are None and dropped by filter
+    return ";".join(filter(None, (
+        f"DRIVER={{ODBC Driver {driver} for SQL Server}}",
+        f"SERVER={server}",
+        f"DATABASE={database}",
+        *fragments,
+        f"UID={username}" if sends_uid and username else None,
+        f"Authority={authority}" if is_aad and authority else None,
+        "Encrypt=yes",
+        "TrustServerCertificate=yes" if is_aad else "TrustServerCertificate=no",
+    )))
 
 
 class StartupController:
@@ -17,6 +179,9 @@ class StartupController:
     Provides methods for open/create flows used by integration tasks.
     """
 
+    # (server, auth_type) pairs known to need ODBC Driver 17 (Azure AD 0x534 on Driver 18); process-wide
+    _driver17_required: set[tuple[str, str]] = set()
+
     def __init__(
         self,
         recent_service: Optional[RecentProjectsService] = None,
@@ -24,17 +189,99 @@ class StartupController:
     ) -> None:
         self.recent_service = recent_service or RecentProjectsService()
         self.logger = logger or LoggingModel()
-        self.view = None
+        self._view = None
+        self._view_caps = 0
+        # Reused Create Project dialogs (built lazily, parented to the current view)
+        self._mode_box = None
+        self._mode_box_buttons = None
+        self._connection_dialog = None
+        self._close_box = None
+        # project key -> blake2b digest of the password last handed to the credential manager
+        self._last_password_hash: dict[str, bytes] = {}
+        # (gateway, enabled) last applied by _apply_db_logging_setting
+        self._observer_state = None
+
+    @property
+    def view(self):
+        return self._view
+
+    @view.setter
+    def view(self, view) -> None:
+        self._view = view
+        caps = 0
+        if view is not None:
+            for name, flag in _VIEW_CAPS:
+                if getattr(view, name, None) is not None:
+                    caps |= flag
+        self._view_caps = caps
 
     # Utility --------------------------------------------------------
     def _log(self, level: str, message: str) -> None:
         self.logger.log(level, message)
-        if self.view is not None and hasattr(self.view, "append_log"):
+        if self._view_caps & _HAS_APPEND_LOG:
             self.view.append_log(level, message)
 
+    def _db_observer(self, evt: dict) -> None:
+        """Gateway observer that mirrors DB operations into the log when 'ui_db_logging' is on."""
+        op = evt.get("op", "?")
+        dur = evt.get("duration_ms", 0.0)
+        if evt.get("success", False):
+            rows = evt.get("rows") or evt.get("rowcount")
+            extra = f", rows={rows}" if rows is not None else ""
+            self._log("INFO", f"DB[{op}] OK in {dur:.1f} ms{extra}")
+        else:
+            cls = evt.get("error_class", "Error")
+            msg = evt.get("error_message", "")
+            self._log("ERROR", f"DB[{op}] FAIL in {dur:.1f} ms [{cls}] {msg}")
+
+    def _apply_db_logging_setting(self) -> None:
+        """Attach or remove the DB observer based on project setting 'ui_db_logging'."""
+        gw = app_context.gateway
+        if gw is None:
+            return
+        enabled = _is_truthy(app_context.get_setting("ui_db_logging", "1"))
+        # Skip set_observer when this gateway already has the wanted observer state
+        if self._observer_state == (gw, enabled):
+            return
+        gw.set_observer(self._db_observer if enabled else None)
+        self._observer_state = (gw, enabled)
+
+    def _get_mode_box(self):
+        """Return (box, btn_local, btn_remote) for the storage-mode prompt, reusing the widget."""
+        if self._mode_box is None or self._mode_box.parent() is not self.view:
+            box = QMessageBox(self.view)
+            box.setWindowTitle("Create Project")
+            box.setText("Choose storage mode for the new project:")
+            btn_local = box.addButton("Local (SQLite)...", QMessageBox.AcceptRole)
+            btn_remote = box.addButton("Remote (MSSQL)...", QMessageBox.ActionRole)
+            box.addButton(QMessageBox.Cancel)
+            self._mode_box = box
+            self._mode_box_buttons = (btn_local, btn_remote)
+        return (self._mode_box, *self._mode_box_buttons)
+
+    def _get_connection_dialog(self):
+        """Return the remote connection dialog, reusing it but requiring a fresh test."""
+        dlg = self._connection_dialog
+        if dlg is None or dlg.parent() is not self.view:
+            dlg = MSSQLConnectionDialog(self.view)
+            self._connection_dialog = dlg
+        else:
+            # Keep server/database for convenience, but never the password or a stale test result
+            dlg.reset_for_reuse()
+        return dlg
+
+    def _record_recent(self, path) -> None:
+        """Move a project to the top of the recent list and update only that row in the view."""
+        entry = self.recent_service.add(str(path))
+        if self.view is None:
+            return
+        if self._view_caps & _HAS_ADD_RECENT:
+            self.view.add_recent_top(entry)
+        elif self._view_caps & _HAS_SHOW_RECENT:
+            self.view.show_recent(self.recent_service.list())
+
     # Slots for MainWindow wiring -----------------------------------
     def on_open_clicked(self) -> None:  # pragma: no cover - UI wiring stub
-        from PySide6.QtWidgets import QFileDialog
 
         self._log("INFO", "Open Project clicked")
         if self.view is None:
@@ -57,26 +304,20 @@ class StartupController:
             self.view,
             "Open Project",
             filter="SQLite Project (*.sqlite);;All Files (*.*)",
+            options=_FILE_DIALOG_OPTIONS,
         )
         if not fname:
             return
         self.open_project(fname)
 
     def on_create_clicked(self) -> None:  # pragma: no cover - UI wiring stub
-        from PySide6.QtWidgets import QFileDialog, QMessageBox, QDialog, QPushButton
-        from src.app.dialogs.mssql_connection_dialog import MSSQLConnectionDialog
 
         self._log("INFO", "Create Project clicked")
         if self.view is None:
             return
 
         # Ask user: Local or Remote
-        box = QMessageBox(self.view)
-        box.setWindowTitle("Create Project")
-        box.setText("Choose storage mode for the new project:")
-        btn_local = box.addButton("Local (SQLite)...", QMessageBox.AcceptRole)
-        btn_remote = box.addButton("Remote (MSSQL)...", QMessageBox.ActionRole)
-        box.addButton(QMessageBox.Cancel)
+        box, btn_local, btn_remote = self._get_mode_box()
         box.exec()
         clicked = box.clickedButton()
 
@@ -85,14 +326,14 @@ class StartupController:
                 self.view,
                 "Create Local Project",
                 filter="SQLite Project (*.sqlite)",
+                options=_FILE_DIALOG_OPTIONS,
             )
             if not fname:
                 return
-            if not fname.lower().endswith(".sqlite"):
+            if Path(fname).suffix.lower() != ".sqlite":
                 fname = f"{fname}.sqlite"
             # Create local project off the UI thread
-            from src.services.background_runner import run_bg
-            if hasattr(self.view, "start_busy"):
+            if self._view_caps & _HAS_START_BUSY:
                 self.view.start_busy()
 
             def work():
@@ -100,22 +341,15 @@ class StartupController:
                 return True
 
             def on_ok(_):
-                # Update recent and UI on the main thread
-                self.recent_service.add(str(fname))
                 self._log("INFO", f"Created local project: {fname}")
-                if self.view is not None and hasattr(self.view, "show_recent"):
-                    self.view.show_recent(self.recent_service.list())
-                if hasattr(self.view, "stop_busy"):
+                if self._view_caps & _HAS_STOP_BUSY:
                     self.view.stop_busy()
-                # Auto-open the newly created project
-                try:
-                    self.open_project(fname)
-                except Exception:
-                    pass
+                # Auto-open the newly created project; the open flow records it in recent
+                self._open_created_project(fname)
 
             def on_err(exc: BaseException):
                 QMessageBox.warning(self.view, "Create Project", str(exc))
-                if hasattr(self.view, "stop_busy"):
+                if self._view_caps & _HAS_STOP_BUSY:
                     self.view.stop_busy()
 
             run_bg(work, on_result=on_ok, on_error=on_err)
@@ -127,74 +361,68 @@ class StartupController:
                 self.view,
                 "Create Remote Project - Choose Settings File",
                 filter="SQLite Project (*.sqlite)",
+                options=_FILE_DIALOG_OPTIONS,
             )
             if not fname:
                 return
-            if not fname.lower().endswith(".sqlite"):
+            if Path(fname).suffix.lower() != ".sqlite":
                 fname = f"{fname}.sqlite"
 
-            dlg = MSSQLConnectionDialog(self.view)
+            dlg = self._get_connection_dialog()
             if dlg.exec() == QMessageBox.Accepted:
-                if hasattr(self.view, "start_busy"):
+                if self._view_caps & _HAS_START_BUSY:
                     self.view.start_busy()
 
                 # Run remote project creation off UI thread
-                from src.services.background_runner import run_bg
                 desc = dlg.descriptor()
                 desc_with_password = dlg.descriptor_with_password()
 
                 def work():
                     # 1) Validate remote connection descriptor (with password for testing)
                     self.create_project_remote(desc_with_password)
-                    # 2) Initialize local settings DB for this project
-                    self.create_project_local(fname)
+                    # 2) Initialize local settings DB for this project, keeping the connection open
+                    conn = self.create_project_local(fname, keep_open=True)
                     # 3) Persist remote descriptor (excluding password) and mark storage_mode in settings
-                    import sqlite3
-                    with sqlite3.connect(fname) as conn:
-                        conn.execute("INSERT OR REPLACE INTO settings(key, value) VALUES('storage_mode', 'mssql')")
-                        server = (desc.get('server') or '')
-                        database = (desc.get('database') or '')
-                        auth_type = (desc.get('auth_type') or 'windows').lower()
-                        port = desc.get('port') if isinstance(desc.get('port'), int) else 1433
-                        username = desc.get('username') or ''
-                        authority = desc.get('authority') or ''
-                        use_driver17 = 1 if desc.get('use_driver17') else 0
-                        kvs = [
-                            ('remote_server', server),
-                            ('remote_database', database),
-                            ('remote_port', str(port)),
-                            ('remote_auth_type', auth_type),
-                            ('remote_username', username),
-                            ('remote_authority', authority),
-                            ('remote_use_driver17', str(use_driver17)),
-                        ]
-                        for k, v in kvs:
-                            conn.execute("INSERT OR REPLACE INTO settings(key, value) VALUES(?, ?)", (k, v))
-                        if auth_type in ('sql', 'windows'):
-                            uname_for_row = username if auth_type == 'sql' else None
-                            conn.execute(
-                                """
-                                INSERT OR REPLACE INTO mssql_connection
-                                  (id, server, database, port, auth_type, username, password)
-                                VALUES (1, ?, ?, ?, ?, ?, NULL)
-                                """,
-                                (server, database, port, auth_type, uname_for_row),
-                            )
-                        conn.commit()
+                    server = (desc.get('server') or '')
+                    database = (desc.get('database') or '')
+                    auth_type = (desc.get('auth_type') or 'windows').lower()
+                    port = desc.get('port') if isinstance(desc.get('port'), int) else 1433
+                    username = desc.get('username') or ''
+                    authority = desc.get('authority') or ''
+                    use_driver17 = 1 if desc.get('use_driver17') else 0
+                    kvs = (
+                        ('storage_mode', 'mssql'),
+                        ('remote_server', server),
+                        ('remote_database', database),
+                        ('remote_port', str(port)),
+                        ('remote_auth_type', auth_type),
+                        ('remote_username', username),
+                        ('remote_authority', authority),
+                        ('remote_use_driver17', str(use_driver17)),
+                    )
+                    try:
+                        # Manage the transaction ourselves: one BEGIN/COMMIT (one fsync) for all rows
+                        conn.isolation_level = None
+                        with conn:
+                            conn.execute("BEGIN IMMEDIATE")
+                            # executemany prepares the statement once and rebinds it per (key, value) row
+                            conn.executemany(_UPSERT_SETTING_SQL, kvs)
+                            if auth_type in ('sql', 'windows'):
+                                uname_for_row = username if auth_type == 'sql' else None
+                                conn.execute(
+                                    _UPSERT_MSSQL_CONNECTION_SQL,
+                                    (server, database, port, auth_type, uname_for_row),
+                                )
+                    finally:
+                        conn.close()
                     return True
 
                 def on_ok(_):
-                    self.recent_service.add(str(fname))
                     self._log("INFO", f"Created remote project settings at: {fname}")
-                    if self.view is not None and hasattr(self.view, "show_recent"):
-                        self.view.show_recent(self.recent_service.list())
-                    if hasattr(self.view, "stop_busy"):
+                    if self._view_caps & _HAS_STOP_BUSY:
                         self.view.stop_busy()
-                    # Auto-open the newly created project
-                    try:
-                        self.open_project(fname)
-                    except Exception:
-                        pass
+                    # Auto-open the newly created project; the open flow records it in recent
+                    self._open_created_project(fname)
 
                 def on_err(exc: BaseException):
                     try:
@@ -214,14 +442,14 @@ class StartupController:
                         self._log("ERROR", f"Create Remote Project failed: {exc_str}")
 
                         QMessageBox.warning(self.view, "Create Remote Project", display_msg)
-                        if hasattr(self.view, "stop_busy"):
+                        if self._view_caps & _HAS_STOP_BUSY:
                             self.view.stop_busy()
                     except Exception as callback_exc:
                         # If the error callback itself fails, log it and try to recover
                         self._log("ERROR", f"Error callback failed: {callback_exc}")
                         try:
                             QMessageBox.warning(self.view, "Create Remote Project", "An error occurred during project creation.")
-                            if hasattr(self.view, "stop_busy"):
+                            if self._view_caps & _HAS_STOP_BUSY:
                                 self.view.stop_busy()
                         except Exception:
                             # Last resort - just log
@@ -246,11 +474,12 @@ class StartupController:
         self.recent_service.remove(path)
         self._log("INFO", f"Removed from recent: {path}")
         if self.view is not None:
-            self.view.show_recent(self.recent_service.list())
+            if self._view_caps & _HAS_REMOVE_RECENT:
+                self.view.remove_recent(path)
+            else:
+                self.view.show_recent(self.recent_service.list())
 
     def on_settings_clicked(self) -> None:  # pragma: no cover - UI wiring stub
-        from PySide6.QtWidgets import QMessageBox
-        from src.app.dialogs.settings_dialog import SettingsDialog
         # Require a loaded project to edit project settings
         if not app_context.project:
             if self.view is not None:
@@ -265,30 +494,10 @@ class StartupController:
                     QMessageBox.warning(self.view, "Settings", f"Failed to save settings: {exc}")
                 return
             # Apply DB logging toggle immediately
-            gw = app_context.gateway
-            if gw is not None:
-                enabled_val = app_context.get_setting("ui_db_logging", "1")
-                enabled = str(enabled_val).strip().lower() in {"1", "true", "on", "yes"}
-                if enabled:
-                    def _db_observer(evt: dict) -> None:
-                        op = evt.get("op", "?")
-                        dur = evt.get("duration_ms", 0.0)
-                        ok = bool(evt.get("success", False))
-                        if ok:
-                            rows = evt.get("rows") or evt.get("rowcount")
-                            extra = f", rows={rows}" if rows is not None else ""
-                            self._log("INFO", f"DB[{op}] OK in {dur:.1f} ms{extra}")
-                        else:
-                            cls = evt.get("error_class", "Error")
-                            msg = evt.get("error_message", "")
-                            self._log("ERROR", f"DB[{op}] FAIL in {dur:.1f} ms [{cls}] {msg}")
-                    gw.set_observer(_db_observer)
-                else:
-                    gw.set_observer(None)
+            self._apply_db_logging_setting()
 
     def on_close_project_clicked(self) -> None:
         """Close the currently open project and return to startup screen"""
-        from PySide6.QtWidgets import QMessageBox
 
         # Check if there's actually a project open
         if not app_context.project:
@@ -300,151 +509,156 @@ class StartupController:
                 )
             return
 
-        # Confirm with user
-        reply = QMessageBox.question(
-            self.view,
-            "Close Project",
-            f"Close the current project?\n\nProject: {app_context.project.sqlite_path.name}",
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.No
-        )
-
-        if reply != QMessageBox.Yes:
+        # Confirm with user; open() keeps the main event loop running instead of a nested exec()
+        box = QMessageBox(self.view)
+        box.setWindowTitle("Close Project")
+        box.setText(f"Close the current project?\n\nProject: {app_context.project.sqlite_path.name}")
+        box.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
+        box.setDefaultButton(QMessageBox.No)
+        box.finished.connect(self._on_close_confirmed)
+        self._close_box = box  # keep a reference while the box is open
+        box.open()
+
+    def _on_close_confirmed(self, _result: int) -> None:
+        box, self._close_box = self._close_box, None
+        if box is None or box.standardButton(box.clickedButton()) != QMessageBox.Yes:
             return
 
-        try:
-            # Close the project (this clears credentials, closes gateway, etc.)
-            app_context.close()
+        if self._view_caps & _HAS_START_BUSY:
+            self.view.start_busy()
+        # Close the project (this clears credentials, closes gateway, etc.) off the UI thread
+        run_bg(app_context.close, on_result=self._on_close_ok, on_error=self._on_close_err)
+
+    def _on_close_ok(self, _result) -> None:
+        self._observer_state = None  # drop the reference to the closed gateway
+        self._close_test_connections()
+        if self._view_caps & _HAS_STOP_BUSY:
+            self.view.stop_busy()
 
-            # Update UI to reflect no project is open
-            if self.view and hasattr(self.view, "set_project_open_state"):
-                self.view.set_project_open_state(False)
+        # Update UI to reflect no project is open
+        if self._view_caps & _HAS_OPEN_STATE:
+            self.view.set_project_open_state(False)
 
-            # Log the action
-            self._log("INFO", "Project closed successfully")
+        # Log the action
+        self._log("INFO", "Project closed successfully")
 
-            # Show success message
-            if self.view is not None:
-                QMessageBox.information(
-                    self.view,
-                    "Close Project",
-                    "Project closed successfully."
-                )
+        # Show success message
+        if self.view is not None:
+            QMessageBox.information(
+                self.view,
+                "Close Project",
+                "Project closed successfully."
+            )
 
-        except Exception as exc:
-            self._log("ERROR", f"Failed to close project: {exc}")
-            if self.view is not None:
-                QMessageBox.warning(
-                    self.view,
-                    "Close Project",
-                    f"Failed to close project:\n\n{exc}"
-                )
+    def _on_close_err(self, exc: BaseException) -> None:
+        if self._view_caps & _HAS_STOP_BUSY:
+            self.view.stop_busy()
+        self._log("ERROR", f"Failed to close project: {exc}")
+        if self.view is not None:
+            QMessageBox.warning(
+                self.view,
+                "Close Project",
+                f"Failed to close project:\n\n{exc}"
+            )
 
     # Flows ----------------------------------------------------------
-    def open_project(self, project_path: str) -> None:
-        from src.services.background_runner import run_bg
-        from PySide6.QtWidgets import QMessageBox
+    def _open_created_project(self, fname: str) -> None:
+        """Auto-open a freshly created project, recording it in recent exactly once."""
+        try:
+            self.open_project(fname, record_on_abort=True)
+        except Exception:
+            # Failed before the open flow could record the project
+            self._record_recent(fname)
+
+    def open_project(self, project_path: str, record_on_abort: bool = False) -> bool:
+        """Start loading a project. Returns False if it bailed out before anything was scheduled.
+
+        With record_on_abort=True the project is still added to recent when opening stops
+        early (missing file, busy UI, failed authentication), e.g. for a just-created project.
+        """
 
         p = Path(project_path)
-        if not p.exists():
+        # One stat up front; the result travels with the probe so nothing re-stats the file
+        try:
+            st = os.stat(p)
+        except OSError:
+            st = None
+        if st is None or not stat.S_ISREG(st.st_mode):
             self._log("ERROR", f"Project not found: {p}")
-            return
+            if record_on_abort:
+                self._record_recent(p)
+            return False
+
+        # Re-activating the project that is already open: nothing to load
+        current = app_context.project
+        if current is not None and _same_path(current.sqlite_path, p):
+            self._log("INFO", f"Project already open: {p}")
+            self._record_recent(p)
+            return True
 
         # Prevent duplicate project loading
-        if hasattr(self.view, "is_busy") and self.view.is_busy():
+        if self._view_caps & _HAS_IS_BUSY and self.view.is_busy():
             self._log("WARNING", f"Project loading already in progress, ignoring duplicate request for: {p}")
-            return
-
-        # For remote projects, authenticate once in main thread
-        storage_mode = self._read_storage_mode_from_project(p)
-        if storage_mode == "mssql":
-            if not self._authenticate_remote_project(p):
-                return  # Authentication failed, don't proceed
+            if record_on_abort:
+                self._record_recent(p)
+            return False
 
-        # Busy UI while loading
-        if self.view is not None and hasattr(self.view, "start_busy"):
+        # Busy UI while the project file is probed off the UI thread
+        if self._view_caps & _HAS_START_BUSY:
             self.view.start_busy()
 
-        def work():
-            # Perform blocking I/O off UI thread - authentication already completed in main thread
-            try:
-                app_context.load_project(str(p))
-                mode = app_context.project.storage_mode if app_context.project else "unknown"
-                return mode
-            except Exception as e:
-                raise
-
-        def on_ok(mode: str) -> None:
-            # Attach or remove DB observer based on project setting 'ui_db_logging'
-            gw = app_context.gateway
-            if gw is not None:
-                enabled_val = app_context.get_setting("ui_db_logging", "1")
-                enabled = str(enabled_val).strip().lower() in {"1", "true", "on", "yes"}
-                if enabled:
-                    def _db_observer(evt: dict) -> None:
-                        op = evt.get("op", "?")
-                        dur = evt.get("duration_ms", 0.0)
-                        ok = bool(evt.get("success", False))
-                        if ok:
-                            rows = evt.get("rows") or evt.get("rowcount")
-                            extra = f", rows={rows}" if rows is not None else ""
-                            self._log("INFO", f"DB[{op}] OK in {dur:.1f} ms{extra}")
-                        else:
-                            cls = evt.get("error_class", "Error")
-                            msg = evt.get("error_message", "")
-                            self._log("ERROR", f"DB[{op}] FAIL in {dur:.1f} ms [{cls}] {msg}")
-                    gw.set_observer(_db_observer)
-                else:
-                    gw.set_observer(None)
-
-            self._log("INFO", f"Opened project: {p} (mode={mode})")
-            self.recent_service.add(str(p))
-            if self.view is not None and hasattr(self.view, "show_recent"):
-                self.view.show_recent(self.recent_service.list())
-            # Enable close project UI since project is now open
-            if self.view is not None and hasattr(self.view, "set_project_open_state"):
-                self.view.set_project_open_state(True)
-            if self.view is not None and hasattr(self.view, "stop_busy"):
+        def abort() -> None:
+            if self._view_caps & _HAS_STOP_BUSY:
                 self.view.stop_busy()
+            if record_on_abort:
+                self._record_recent(p)
 
-        def on_err(exc: BaseException) -> None:
-            try:
-                exc_str = str(exc)
-
-                # Handle schema validation errors specially
-                if exc_str in ("SCHEMA_DEPLOYMENT_REQUIRED", "SCHEMA_DEVIATIONS_DETECTED"):
-                    self._handle_schema_validation_error(p, exc_str)
+        def on_probe(descriptor) -> None:
+            if descriptor is not None:
+                # Remote project: prompt/authenticate once in main thread, without the busy overlay
+                if self._view_caps & _HAS_STOP_BUSY:
+                    self.view.stop_busy()
+                self._current_project_path = p
+                if not self._prompt_and_authenticate(descriptor):
+                    abort()  # Authentication failed, don't proceed
                     return
+                if self._view_caps & _HAS_START_BUSY:
+                    self.view.start_busy()
+            self._start_project_load(p, record_on_abort)
 
-                self._log("ERROR", f"Failed to initialize project DB: {exc}")
-                # Keep recent updated even if gateway init failed, so user can retry
-                self.recent_service.add(str(p))
-                if self.view is not None and hasattr(self.view, "show_recent"):
-                    self.view.show_recent(self.recent_service.list())
-                if self.view is not None:
-                    try:
-                        QMessageBox.warning(self.view, "Open Project", str(exc))
-                    except Exception:
-                        pass
-                if self.view is not None and hasattr(self.view, "stop_busy"):
-                    self.view.stop_busy()
-            except Exception as e:
-                import traceback
-                traceback.print_exc()
+        def on_probe_err(exc: BaseException) -> None:
+            QMessageBox.critical(
+                self.view,
+                "Project Opening Failed",
+                f"Cannot read project configuration:\n\n{exc}\n\nPlease check the project file."
+            )
+            abort()
 
-        run_bg(work, on_result=on_ok, on_error=on_err)
+        run_bg(lambda: self._read_remote_descriptor_bg(p, st), on_result=on_probe, on_error=on_probe_err)
+        return True
+
+    def _start_project_load(self, p: Path, record_on_abort: bool = False) -> None:
+        """Load the project in the background; authentication has already happened."""
+        job = _OpenProjectJob(self, p, record_on_abort)
+        run_bg(job.run, on_result=job.on_success, on_error=job.on_error)
+
+    def _handle_schema_validation_error(
+        self, project_path: Path, error_type: str, record_on_abort: bool = False
+    ) -> None:
+        """Handle schema validation errors with user interaction
 
-    def _handle_schema_validation_error(self, project_path: Path, error_type: str) -> None:
-        """Handle schema validation errors with user interaction"""
-        from src.app.dialogs.schema_validation_dialog import SchemaValidationDialog, SchemaDeploymentProgressDialog
-        from src.services.background_runner import run_bg
+        record_on_abort has the same meaning as for open_project: the project is added
+        to recent even if the user cancels or deployment/loading fails.
+        """
 
         # Get pending validation data
         validation_data = app_context.get_pending_schema_validation()
         if not validation_data:
             self._log("ERROR", "Schema validation error but no pending data")
-            if self.view is not None and hasattr(self.view, "stop_busy"):
+            if self._view_caps & _HAS_STOP_BUSY:
                 self.view.stop_busy()
+            if record_on_abort:
+                self._record_recent(project_path)
             return
 
         result = validation_data['result']
@@ -453,35 +667,38 @@ class StartupController:
         # Show schema validation dialog
         dialog = SchemaValidationDialog(self.view, result, project_name)
 
-        if self.view is not None and hasattr(self.view, "stop_busy"):
+        if self._view_caps & _HAS_STOP_BUSY:
             self.view.stop_busy()
 
         if dialog.exec() == QDialog.Accepted:
             choice = dialog.user_choice
 
             if choice == 'deploy':
-                self._deploy_schema_and_continue(project_path)
+                self._deploy_schema_and_continue(project_path, record_on_abort)
                 return  # Don't clear validation data yet - deployment needs it
             elif choice == 'proceed':
-                self._proceed_with_project_loading(project_path)
-            # 'cancel' - do nothing, project loading is cancelled
+                self._proceed_with_project_loading(project_path, record_on_abort)
+            elif record_on_abort:
+                self._record_recent(project_path)
+            # 'cancel' - otherwise nothing to do, project loading is cancelled
+        elif record_on_abort:
+            self._record_recent(project_path)
 
         # Clear pending validation data (only if not deploying)
         app_context.clear_pending_schema_validation()
 
-    def _deploy_schema_and_continue(self, project_path: Path) -> None:
+    def _deploy_schema_and_continue(self, project_path: Path, record_on_abort: bool = False) -> None:
         """Deploy schema and continue with project loading"""
-        from src.app.dialogs.schema_validation_dialog import SchemaDeploymentProgressDialog
-        from src.services.background_runner import run_bg
 
         # Show progress dialog
         progress_dialog = SchemaDeploymentProgressDialog(self.view)
         progress_dialog.show()
 
         def deploy_work():
-            progress_dialog.update_status("Deploying schema...")
+            # Worker thread: status updates go through the dialog's queued signal
+            progress_dialog.statusChanged.emit("Deploying schema...")
             app_context.handle_schema_deployment()
-            progress_dialog.update_status("Schema deployment completed...")
+            progress_dialog.statusChanged.emit("Schema deployment completed...")
             # No need to reload project - schema deployment just added tables to existing connection
             return app_context.project.storage_mode if app_context.project else "unknown"
 
@@ -491,25 +708,24 @@ class StartupController:
             app_context.clear_pending_schema_validation()
             self._log("INFO", f"Schema deployed successfully for project: {project_path}")
             self._log("INFO", f"Opened project: {project_path} (mode={mode})")
-            self.recent_service.add(str(project_path))
-            if self.view is not None and hasattr(self.view, "show_recent"):
-                self.view.show_recent(self.recent_service.list())
+            self._record_recent(project_path)
 
         def deploy_error(exc: BaseException):
             progress_dialog.close()
             # Clear pending validation data after deployment failure
             app_context.clear_pending_schema_validation()
             self._log("ERROR", f"Schema deployment failed: {exc}")
+            if record_on_abort:
+                self._record_recent(project_path)
             QMessageBox.critical(self.view, "Schema Deployment Failed",
                                f"Failed to deploy database schema:\n\n{exc}")
 
         run_bg(deploy_work, on_result=deploy_success, on_error=deploy_error)
 
-    def _proceed_with_project_loading(self, project_path: Path) -> None:
+    def _proceed_with_project_loading(self, project_path: Path, record_on_abort: bool = False) -> None:
         """Proceed with project loading despite schema issues"""
-        from src.services.background_runner import run_bg
 
-        if self.view is not None and hasattr(self.view, "start_busy"):
+        if self._view_caps & _HAS_START_BUSY:
             self.view.start_busy()
 
         def work():
@@ -520,28 +736,28 @@ class StartupController:
 
         def on_ok(mode: str):
             self._log("WARNING", f"Opened project with schema deviations: {project_path} (mode={mode})")
-            self.recent_service.add(str(project_path))
-            if self.view is not None and hasattr(self.view, "show_recent"):
-                self.view.show_recent(self.recent_service.list())
+            self._record_recent(project_path)
             # Enable close project UI since project is now open
-            if self.view is not None and hasattr(self.view, "set_project_open_state"):
+            if self._view_caps & _HAS_OPEN_STATE:
                 self.view.set_project_open_state(True)
-            if self.view is not None and hasattr(self.view, "stop_busy"):
+            if self._view_caps & _HAS_STOP_BUSY:
                 self.view.stop_busy()
 
         def on_err(exc: BaseException):
             self._log("ERROR", f"Failed to open project: {exc}")
+            if record_on_abort:
+                self._record_recent(project_path)
             QMessageBox.warning(self.view, "Open Project", str(exc))
-            if self.view is not None and hasattr(self.view, "stop_busy"):
+            if self._view_caps & _HAS_STOP_BUSY:
                 self.view.stop_busy()
 
         run_bg(work, on_result=on_ok, on_error=on_err)
 
-    def create_project_local(self, target_path: str) -> None:
+    def create_project_local(self, target_path: str, keep_open: bool = False) -> Optional[sqlite3.Connection]:
         # Pure creation operation; no UI or logging from background threads
-        creator = ProjectCreatorLocal(target_path)
-        creator.create()
         # Caller is responsible for logging, recent updates, and UI refresh on the UI thread
+        creator = ProjectCreatorLocal(target_path)
+        return creator.create(keep_open=keep_open)
 
     def create_project_remote(self, descriptor: dict) -> None:
         # Pure validation of remote descriptor; no UI or logging here
@@ -550,90 +766,110 @@ class StartupController:
         # Caller handles any subsequent UI/logging
 
     # Helper methods for connection testing -------------------------
-    def _read_storage_mode_from_project(self, project_path: Path) -> str:
-        """Read storage mode from project file without loading the full project"""
-        import sqlite3
+    def _read_project_settings(
+        self,
+        project_path: Path,
+        keys: tuple[str, ...] = _OPEN_SETTINGS_KEYS,
+        sql: Optional[str] = _OPEN_SETTINGS_SQL,
+        st: Optional[os.stat_result] = None,
+    ) -> dict[str, str]:
+        """Read the given settings rows with a single read-only open of the project file.
+
+        ``st`` is an already-taken stat of the file; an empty file has no settings table.
+        """
+        if st is not None and st.st_size == 0:
+            return {}
+        if sql is None:
+            sql = "SELECT key, value FROM settings WHERE key IN ({})".format(','.join('?' * len(keys)))
+        # abspath instead of resolve(): no symlink walk (one stat per path component)
+        uri = Path(os.path.abspath(project_path)).as_uri()
+        # immutable=1 skips journal/WAL sidecar handling entirely, but it would miss rows
+        # still sitting in an un-checkpointed WAL file (or a file being written right now),
+        # so plain read-only mode is the fallback
+        if project_path.with_name(project_path.name + "-wal").exists():
+            attempts = ("mode=ro",)
+        else:
+            attempts = ("mode=ro&immutable=1", "mode=ro")
+        last_exc: Optional[sqlite3.Error] = None
+        for params in attempts:
+            try:
+                conn = sqlite3.connect(f"{uri}?{params}", uri=True)
+            except sqlite3.Error as e:
+                last_exc = e
+                continue
+            try:
+                return dict(conn.execute(sql, keys).fetchall())
+            except sqlite3.OperationalError as e:
+                if "no such table" in str(e):
+                    return {}  # Not a project settings DB (yet); treat as plain sqlite
+                last_exc = e
+            except sqlite3.DatabaseError as e:
+                last_exc = e
+            finally:
+                conn.close()
+        raise last_exc
+
+    def _read_remote_descriptor_bg(self, project_path: Path, st: Optional[os.stat_result] = None):
+        """Read the project's storage mode and, for remote projects, its connection descriptor.
+
+        Touches only the project file (no UI), so it is safe to call from a worker thread.
+        Returns None for local projects; raises ValueError for incomplete remote settings.
+        """
         try:
-            with sqlite3.connect(str(project_path)) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT value FROM settings WHERE key = 'storage_mode'")
-                row = cursor.fetchone()
-                return row[0] if row else "sqlite"
+            settings = self._read_project_settings(project_path, st=st)
         except Exception:
-            return "sqlite"  # Default fallback
+            return None  # Unreadable settings: let the regular load report the problem
+        if settings.get("storage_mode", "sqlite") != "mssql":
+            return None
+
+        server = settings.get('remote_server')
+        database = settings.get('remote_database')
+        auth_type = settings.get('remote_auth_type')
+        username = settings.get('remote_username')
+        authority = settings.get('remote_authority')
+        port = settings.get('remote_port')
+
+        if not server or not database or not auth_type:
+            raise ValueError("Incomplete MSSQL connection configuration")
+
+        # Add port to server if provided (same logic as app_context._read_remote_descriptor)
+        if server and "," not in server and port and port.isdigit():
+            server = f"{server},{port}"
+
+        return ConnectionDescriptor(
+            server=server,
+            database=database,
+            auth_type=auth_type,
+            username=username,
+            authority=authority,
+            timeout_seconds=30
+        )
 
-    def _authenticate_remote_project(self, project_path: Path) -> bool:
+    def _prompt_and_authenticate(self, descriptor) -> bool:
         """Authenticate remote database connection once and cache token (main thread only)"""
-        from PySide6.QtWidgets import QMessageBox
-        from src.services.azure_ad_token_manager import get_token_manager, ConnectionDescriptor
-        import sqlite3
+        try:
+            # Handle authentication based on auth type
+            if descriptor.auth_type == "sql":
+                # For SQL authentication, prompt for password since it's not stored
+                return self._authenticate_sql_project(descriptor)
 
-        # Store project path for credential management
-        self._current_project_path = project_path
+            # For Azure AD authentication, use token manager
+            token_manager = get_token_manager()
+            success = token_manager.authenticate_and_cache(descriptor)
 
-        try:
-            # Read connection details from project file
-            with sqlite3.connect(str(project_path)) as conn:
-                cursor = conn.cursor()
-
-                settings_keys = [
-                    'remote_server', 'remote_database', 'remote_auth_type',
-                    'remote_username', 'remote_authority', 'remote_port'
-                ]
-
-                cursor.execute("""
-                    SELECT key, value FROM settings
-                    WHERE key IN ({})
-                """.format(','.join('?' * len(settings_keys))), settings_keys)
-
-                settings = dict(cursor.fetchall())
-
-                server = settings.get('remote_server')
-                database = settings.get('remote_database')
-                auth_type = settings.get('remote_auth_type')
-                username = settings.get('remote_username')
-                authority = settings.get('remote_authority')
-                port = settings.get('remote_port')
-
-                if not server or not database or not auth_type:
-                    raise ValueError("Incomplete MSSQL connection configuration")
-
-                # Add port to server if provided (same logic as app_context._read_remote_descriptor)
-                if server and "," not in server and port and port.isdigit():
-                    server = f"{server},{port}"
-
-                # Create connection descriptor
-                descriptor = ConnectionDescriptor(
-                    server=server,
-                    database=database,
-                    auth_type=auth_type,
-                    username=username,
-                    authority=authority,
-                    timeout_seconds=30
+            if not success:
+                QMessageBox.critical(
+                    self.view,
+                    "Authentication Failed",
+                    f"Cannot authenticate to remote database.\n\n"
+                    f"Server: {descriptor.server}\n"
+                    f"Database: {descriptor.database}\n"
+                    f"Auth Type: {descriptor.auth_type}\n\n"
+                    f"Please check your credentials and try again."
                 )
+                return False
 
-                # Handle authentication based on auth type
-                if auth_type.lower() == "sql":
-                    # For SQL authentication, prompt for password since it's not stored
-                    return self._authenticate_sql_project(descriptor)
-                else:
-                    # For Azure AD authentication, use token manager
-                    token_manager = get_token_manager()
-                    success = token_manager.authenticate_and_cache(descriptor)
-
-                    if not success:
-                        QMessageBox.critical(
-                            self.view,
-                            "Authentication Failed",
-                            f"Cannot authenticate to remote database.\n\n"
-                            f"Server: {server}\n"
-                            f"Database: {database}\n"
-                            f"Auth Type: {auth_type}\n\n"
-                            f"Please check your credentials and try again."
-                        )
-                        return False
-
-                    return True
+            return True
 
         except Exception as e:
             QMessageBox.critical(
@@ -645,8 +881,6 @@ class StartupController:
 
     def _authenticate_sql_project(self, descriptor) -> bool:
         """Authenticate SQL Server project by prompting for password"""
-        from src.app.dialogs.mssql_connection_dialog import MSSQLConnectionDialog
-        from PySide6.QtWidgets import QMessageBox
 
         # Create dialog with pre-filled connection details
         dialog = MSSQLConnectionDialog(self.view)
@@ -657,13 +891,8 @@ class StartupController:
         dialog.database.setText(descriptor.database or "")
 
         # Map internal auth_type to display name
-        auth_type_display_mapping = {
-            "sql": "MS-SQL",
-            "azure_ad_interactive": "Azure AD Interactive",
-            "azure_ad_integrated": "Azure AD Integrated"
-        }
         internal_auth_type = descriptor.auth_type or "sql"
-        display_auth_type = auth_type_display_mapping.get(internal_auth_type, "MS-SQL")
+        display_auth_type = _AUTH_DISPLAY.get(internal_auth_type, "MS-SQL")
         dialog.auth_type.setCurrentText(display_auth_type)
 
         dialog.username.setText(descriptor.username or "")
@@ -672,16 +901,19 @@ class StartupController:
         dialog.password.setFocus()
 
         # Show dialog and wait for user input
-        from PySide6.QtWidgets import QDialog
         if dialog.exec() == QDialog.Accepted:
             # Test connection was successful, store password securely for project session
             password = dialog.password.text()
             if password:
-                # Store password securely in credential manager
-                from src.services.secure_credential_manager import get_credential_manager
+                # Store password securely in credential manager, skipping the (OS-backed)
+                # write when the same password is still held for this project
                 credential_manager = get_credential_manager()
                 project_key = str(self._current_project_path)
-                credential_manager.store_password(project_key, password)
+                digest = hashlib.blake2b(password.encode("utf-8"), digest_size=16).digest()
+                if (self._last_password_hash.get(project_key) != digest
+                        or not credential_manager.has_password(project_key)):
+                    credential_manager.store_password(project_key, password)
+                    self._last_password_hash[project_key] = digest
             return True
         else:
             # User cancelled or connection failed
@@ -689,125 +921,163 @@ class StartupController:
 
     def _perform_connection_test(self, descriptor: dict) -> bool:
         """Perform actual connection test in main thread using token manager"""
-        from PySide6.QtWidgets import QMessageBox
-        from src.services.azure_ad_token_manager import get_token_manager, ConnectionDescriptor
-
+        driver17_key = (descriptor.get("server", ""), descriptor.get("auth_type", ""))
+        use_driver17 = driver17_key in self._driver17_required
+        auth_type = (descriptor.get("auth_type") or "").lower()
+        is_aad = auth_type.startswith("azure_ad")
         try:
+            if use_driver17:
+                # Driver 18 already failed with 0x534 for this server; skip straight to Driver 17
+                self._connect_driver17_for_test(descriptor)
+                return True
+
             # Create connection descriptor for token manager
-            conn_descriptor = ConnectionDescriptor(
-                server=descriptor.get("server", ""),
-                database=descriptor.get("database", ""),
-                auth_type=descriptor.get("auth_type", "windows"),
-                username=descriptor.get("username"),
-                authority=descriptor.get("authority"),
-                timeout_seconds=descriptor.get("connect_timeout_seconds", 30)
-            )
+            cd_kwargs = {name: descriptor.get(name, default) for name, default in _CD_FIELDS}
+            cd_kwargs["timeout_seconds"] = descriptor.get("connect_timeout_seconds", 30)
+            conn_descriptor = ConnectionDescriptor(**cd_kwargs)
 
             # Use token manager for Azure AD authentication
-            if conn_descriptor.auth_type.startswith("azure_ad"):
+            if is_aad:
                 token_manager = get_token_manager()
                 conn_str = token_manager.get_connection_string(conn_descriptor)
 
                 # Test the connection
-                import pyodbc
-                with pyodbc.connect(conn_str, autocommit=True, timeout=conn_descriptor.timeout_seconds):
-                    pass
+                self._probe_connection(conn_str, conn_descriptor.timeout_seconds)
 
                 return True  # Connection successful and token cached
             else:
                 # Non-Azure AD authentication - use traditional method
-                from src.services.mssql_connection import build_connect_kwargs
-                kwargs = build_connect_kwargs(descriptor)
-                if not kwargs.get("Server") or not kwargs.get("Database"):
-                    raise ValueError("Server and Database are required")
-
-                conn_str = self._build_connection_string_for_test(descriptor)
-                import pyodbc
-                timeout_sec = kwargs.get("Timeout", 30)
-                with pyodbc.connect(conn_str, autocommit=True, timeout=timeout_sec):
-                    pass
+                conn_str, timeout_sec = self._build_connection_string_for_test(descriptor)
+                # The test string carries no port, so probe what the driver will dial
+                endpoint = sql_server_endpoint(descriptor.get("server"))
+                self._probe_connection(conn_str, timeout_sec, endpoint)
 
                 return True  # Connection successful
 
         except Exception as e:
             # Handle Azure AD Interactive 0x534 error with fallback to Driver 17
-            if "0x534" in str(e) and descriptor.get("auth_type") == "azure_ad_interactive":
+            if not use_driver17 and auth_type == "azure_ad_interactive" and is_aad_0x534(e):
+                # Remember the decision so later tests against this server skip the Driver 18 attempt
+                self._driver17_required.add(driver17_key)
                 try:
-                    conn_str_17 = self._build_connection_string_for_test_driver17(descriptor)
-                    import pyodbc
-                    with pyodbc.connect(conn_str_17, autocommit=True, timeout=descriptor.get("connect_timeout_seconds", 30)):
-                        pass
-
-                    # Cache the successful authentication with Driver 17
-                    # Update the connection string building to use Driver 17 for this descriptor
+                    self._connect_driver17_for_test(descriptor)
                     return True  # Connection successful with Driver 17
                 except Exception as e2:
                     e = e2  # Use the Driver 17 error for display
 
-            QMessageBox.critical(
-                self.view,
+            # Truncate very long driver errors, and show the box on the next event-loop
+            # tick so the test returns to its caller right away
+            display_msg = str(e)
+            if len(display_msg) > _MAX_ERROR_DISPLAY_CHARS:
+                display_msg = display_msg[:_MAX_ERROR_DISPLAY_CHARS] + "..."
+            view = self.view
+            QTimer.singleShot(0, lambda: QMessageBox.critical(
+                view,
                 "Connection Test Failed",
-                f"Cannot connect to remote database:\n\n{e}\n\nPlease check your connection settings and try again."
-            )
+                f"Cannot connect to remote database:\n\n{display_msg}\n\nPlease check your connection settings and try again."
+            ))
             return False
 
-    def _build_connection_string_for_test(self, descriptor: dict) -> str:
-        """Build ODBC connection string for testing (same as MSSQLConnectionDialog)"""
-        parts = ["DRIVER={ODBC Driver 18 for SQL Server}"]
-
-        if descriptor.get("server"):
-            parts.append(f"SERVER={descriptor['server']}")
-        if descriptor.get("database"):
-            parts.append(f"DATABASE={descriptor['database']}")
+    def _connect_driver17_for_test(self, descriptor: dict) -> None:
+        conn_str_17, timeout_sec = self._build_connection_string_for_test_driver17(descriptor)
+        self._probe_connection(conn_str_17, timeout_sec)
 
-        auth_type = (descriptor.get("auth_type") or "").lower()
-        if auth_type == "windows":
-            parts.append("Trusted_Connection=yes")
-        elif auth_type == "sql":
-            if descriptor.get("username"):
-                parts.append(f"UID={descriptor['username']}")
-        elif auth_type == "azure_ad_interactive":
-            parts.append("Authentication=ActiveDirectoryInteractive")
-            if descriptor.get("username"):
-                parts.append(f"UID={descriptor['username']}")
-        elif auth_type == "azure_ad_password":
-            parts.append("Authentication=ActiveDirectoryPassword")
-            if descriptor.get("username"):
-                parts.append(f"UID={descriptor['username']}")
-        elif auth_type == "azure_ad_integrated":
-            parts.append("Authentication=ActiveDirectoryIntegrated")
-        elif auth_type == "azure_ad_device_code":
-            parts.append("Authentication=ActiveDirectoryDeviceCode")
-            if descriptor.get("username"):
-                parts.append(f"UID={descriptor['username']}")
-        else:
-            parts.append("Trusted_Connection=yes")
+    def _probe_connection(self, conn_str: str, timeout: int, endpoint: Optional[tuple[str, int]] = None) -> None:
+        """Connect for a connection test, reusing a probe connection opened within the TTL.
 
-        if auth_type.startswith("azure_ad") and descriptor.get("authority"):
-            parts.append(f"Authority={descriptor['authority']}")
+        When endpoint is given, a new connection is preceded by a quick TCP probe so
+        an unreachable server fails fast (TimeoutError) instead of after the full
+        login timeout.
+        """
+        # Keyed by the connection string itself (the shared cache also expires and
+        # closes other entries on every lookup)
+        if test_connections.reuse(conn_str):
+            return
+        if endpoint is not None:
+            ensure_reachable(endpoint)
+        conn = _load_pyodbc().connect(conn_str, autocommit=True, timeout=timeout)
+        test_connections.remember(conn_str, conn)
 
-        parts.append("Encrypt=yes")
-        if auth_type.startswith("azure_ad"):
-            parts.append("TrustServerCertificate=yes")
-        else:
-            parts.append("TrustServerCertificate=no")
+    def _close_test_connections(self) -> None:
+        """Close every cached connection-test handle."""
+        test_connections.clear()
 
-        return ";".join(parts)
+    def _build_connection_string_for_test(self, descriptor: dict) -> tuple[str, int]:
+        """Build (ODBC connection string, timeout) for testing (same as MSSQLConnectionDialog)"""
+        return _test_conn_params(descriptor)
 
-    def _build_connection_string_for_test_driver17(self, descriptor: dict) -> str:
-        """Build ODBC connection string using Driver 17 for fallback"""
-        conn_str = self._build_connection_string_for_test(descriptor)
-        return conn_str.replace("ODBC Driver 18 for SQL Server", "ODBC Driver 17 for SQL Server")
+    def _build_connection_string_for_test_driver17(self, descriptor: dict) -> tuple[str, int]:
+        """Build (ODBC connection string, timeout) using Driver 17 for fallback"""
+        return _test_conn_params(descriptor, driver="17")
 
     # View attachment ------------------------------------------------
     def attach_view(self, view) -> None:  # pragma: no cover - UI wiring stub
         self.view = view
         if hasattr(view, "set_controller"):
             view.set_controller(self)
-        if hasattr(view, "show_recent"):
+        if self._view_caps & _HAS_SHOW_RECENT:
             view.show_recent(self.recent_service.list())
-        # Replay existing logs to the view
-        if hasattr(self.logger, "entries") and hasattr(view, "append_log"):
-            for e in self.logger.entries():
-                view.append_log(e.level, e.message)
+        # Replay existing logs to the view (repaints batched until the replay is done)
+        if hasattr(self.logger, "entries") and self._view_caps & _HAS_APPEND_LOG:
+            append = view.append_log
+            batch = hasattr(view, "setUpdatesEnabled")
+            if batch:
+                view.setUpdatesEnabled(False)
+            try:
+                for e in self.logger.entries():
+                    append(e.level, e.message)
+            finally:
+                if batch:
+                    view.setUpdatesEnabled(True)
+
+
+@dataclass(slots=True)
+class _OpenProjectJob:
+    """One background project load; its bound methods are the run_bg callbacks."""
+
+    controller: StartupController
+    project_path: Path
+    record_on_abort: bool = False
+
+    def run(self) -> str:
+        # Perform blocking I/O off UI thread - authentication already completed in main thread
+        app_context.load_project(str(self.project_path))
+        return app_context.project.storage_mode if app_context.project else "unknown"
+
+    def on_success(self, mode: str) -> None:
+        ctrl, p = self.controller, self.project_path
+        ctrl._apply_db_logging_setting()
+        # The project has its own connection now; connection-test handles are done
+        ctrl._close_test_connections()
+
+        ctrl._log("INFO", f"Opened project: {p} (mode={mode})")
+        ctrl._record_recent(p)
+        # Enable close project UI since project is now open
+        if ctrl._view_caps & _HAS_OPEN_STATE:
+            ctrl.view.set_project_open_state(True)
+        if ctrl._view_caps & _HAS_STOP_BUSY:
+            ctrl.view.stop_busy()
+
+    def on_error(self, exc: BaseException) -> None:
+        ctrl, p = self.controller, self.project_path
+        try:
+            exc_str = str(exc)
+
+            # Handle schema validation errors specially
+            if exc_str in ("SCHEMA_DEPLOYMENT_REQUIRED", "SCHEMA_DEVIATIONS_DETECTED"):
+                ctrl._handle_schema_validation_error(p, exc_str, self.record_on_abort)
+                return
 
+            ctrl._log("ERROR", f"Failed to initialize project DB: {exc}")
+            # Keep recent updated even if gateway init failed, so user can retry
+            ctrl._record_recent(p)
+            if ctrl.view is not None:
+                try:
+                    QMessageBox.warning(ctrl.view, "Open Project", str(exc))
+                except Exception:
+                    pass
+            if ctrl._view_caps & _HAS_STOP_BUSY:
+                ctrl.view.stop_busy()
+        except Exception:
+            import traceback
+            traceback.print_exc()
@@ -1,5 +1,13 @@
 from __future__ import annotations
 
+import hashlib
+import sys
+import time
+from functools import lru_cache
+from types import MappingProxyType
+
+import shiboken6
+from PySide6.QtCore import Qt, QTimer, Slot
 from PySide6.QtWidgets import (
     QDialog,
     QVBoxLayout,
@@ -11,7 +19,195 @@ from PySide6.QtWidgets import (
     QMessageBox,
 )
 
-from src.services.mssql_connection import build_connect_kwargs, map_exception
+from src.services.background_runner import run_connect_bg
+from src.services.mssql_connection import build_connect_kwargs, driver_error_codes, map_exception
+from src.services.net_probe import ensure_reachable, sql_server_endpoint
+from src.services.odbc_pool import TEST_CONN_TTL_SECONDS, load_pyodbc, test_connections
+
+# Fixed connection-string fragments, built once per process.
+# Do not include timeout in the connection string; pass via pyodbc.connect(..., timeout=...)
+_DRIVER_18 = "DRIVER={ODBC Driver 18 for SQL Server}"
+_DRIVER_17 = "DRIVER={ODBC Driver 17 for SQL Server}"
+# For Azure AD authentication, trust server certificate to allow browser authentication
+_TLS_AAD = "Encrypt=yes;TrustServerCertificate=yes"
+_TLS_DEFAULT = "Encrypt=yes;TrustServerCertificate=no"
+
+# Internal auth_type values, interned so comparisons against them are identity checks
+_AUTH_WINDOWS = sys.intern("windows")
+_AUTH_SQL = sys.intern("sql")
+_AUTH_AAD_INTERACTIVE = sys.intern("azure_ad_interactive")
+_AUTH_AAD_PASSWORD = sys.intern("azure_ad_password")
+_AUTH_AAD_INTEGRATED = sys.intern("azure_ad_integrated")
+_AUTH_AAD_DEVICE_CODE = sys.intern("azure_ad_device_code")
+_AZURE_AD_MODES = frozenset({
+    _AUTH_AAD_INTERACTIVE, _AUTH_AAD_PASSWORD, _AUTH_AAD_INTEGRATED, _AUTH_AAD_DEVICE_CODE,
+})
+
+# Auth combo display name -> internal auth_type
+_DISPLAY_TO_AUTH = MappingProxyType({
+    "MS-SQL": _AUTH_SQL,
+    "Azure AD Interactive": _AUTH_AAD_INTERACTIVE,
+    "Azure AD Integrated": _AUTH_AAD_INTEGRATED,
+})
+
+# auth_type -> (needs username, needs password, message) checked before a Test Connection
+_TEST_REQUIREMENTS = {
+    _AUTH_SQL: (True, True, "Username and Password are required for MS-SQL authentication"),
+    _AUTH_AAD_INTERACTIVE: (True, False, "Username is required for Azure AD Interactive authentication"),
+}
+
+_DRIVERS = {"18": _DRIVER_18, "17": _DRIVER_17}
+
+# Key prefixes, concatenated directly instead of formatted per call
+_PREFIX_SERVER = "SERVER="
+_PREFIX_DATABASE = "DATABASE="
+_PREFIX_UID = "UID="
+_PREFIX_PWD = ";PWD="
+_PREFIX_AUTHORITY = "Authority="
+
+# auth_type -> (connection-string fragments, sends UID, sends PWD); unknown types use Windows auth
+_AUTH_PARTS = {
+    _AUTH_WINDOWS: (("Trusted_Connection=yes",), False, False),
+    _AUTH_SQL: ((), True, True),
+    _AUTH_AAD_INTERACTIVE: (("Authentication=ActiveDirectoryInteractive",), True, False),
+    _AUTH_AAD_PASSWORD: (("Authentication=ActiveDirectoryPassword",), True, True),
+    _AUTH_AAD_INTEGRATED: (("Authentication=ActiveDirectoryIntegrated",), False, False),
+    _AUTH_AAD_DEVICE_CODE: (("Authentication=ActiveDirectoryDeviceCode",), True, False),
+}
+
+
+def _auth_pieces(mode: str, uid) -> tuple[str, ...]:
+    """Authentication pieces (mode fragments, then UID if the mode sends one)."""
+    fragments, sends_uid, _ = _AUTH_PARTS.get(mode, _AUTH_PARTS[_AUTH_WINDOWS])
+    if sends_uid and uid:
+        return (*fragments, _PREFIX_UID + uid)
+    return fragments
+
+
+@lru_cache(maxsize=32)
+def _odbc_conn_parts(driver: str, server, database, mode: str, uid, authority) -> tuple[str, str, bool]:
+    """Password-free (head, tail, sends_pwd) of a connection string; pure, so memoized."""
+    is_aad = mode in _AZURE_AD_MODES
+    sends_pwd = _AUTH_PARTS.get(mode, _AUTH_PARTS[_AUTH_WINDOWS])[2]
+    head = ";".join((
+        _DRIVERS[driver],
+        *((_PREFIX_SERVER + server,) if server else ()),
+        *((_PREFIX_DATABASE + database,) if database else ()),
+        *_auth_pieces(mode, uid),
+    ))
+    tail = ";".join((
+        # Optional Authority/Tenant for AAD modes
+        *((_PREFIX_AUTHORITY + authority,) if is_aad and authority else ()),
+        _TLS_AAD if is_aad else _TLS_DEFAULT,
+    ))
+    return head, tail, sends_pwd
+
+
+def _odbc_conn_str(desc: dict, pwd: str, driver: str = "18") -> str:
+    """DSN-less ODBC connection string for desc; the password is added after the cache lookup."""
+    server = desc.get("server")
+    port = desc.get("port")
+    # Port is appended to the server (same rule as build_connect_kwargs)
+    if server and port and isinstance(port, int) and "," not in str(server):
+        server = server + "," + str(port)
+    mode = sys.intern((desc.get("auth_type") or "").lower())
+    head, tail, sends_pwd = _odbc_conn_parts(
+        driver, server, desc.get("database"), mode, desc.get("username"), desc.get("authority")
+    )
+    if sends_pwd and pwd:
+        return head + _PREFIX_PWD + pwd + ";" + tail
+    return head + ";" + tail
+
+
+# While a dialog is open, expired test handles (odbc_pool.test_connections) are
+# closed on this interval; all of them are closed when it finishes
+_TEST_CONN_SWEEP_MS = 60_000
+
+
+def _test_conn_cache_key(desc: dict, driver: str, pwd: str) -> tuple:
+    # The password is part of the identity (a cached handle must not vouch for a
+    # different password) but only a digest of it is kept in the key
+    pwd_digest = hashlib.blake2b(pwd.encode("utf-8"), digest_size=16).digest() if pwd else b""
+    return (
+        desc.get("server"),
+        desc.get("database"),
+        desc.get("port"),
+        desc.get("auth_type"),
+        desc.get("username"),
+        driver,
+        pwd_digest,
+    )
+
+
+_PYODBC_UNPROBED = object()
+_pyodbc = _PYODBC_UNPROBED
+
+
+def _get_pyodbc():
+    """pyodbc with pooling enabled, or None when it is not installed.
+
+    The import is attempted once per process, so a missing driver module costs
+    no import machinery or exception on later Test clicks.
+    """
+    global _pyodbc
+    if _pyodbc is _PYODBC_UNPROBED:
+        try:
+            _pyodbc = load_pyodbc()
+        except ImportError:
+            _pyodbc = None
+    return _pyodbc
+
+
+def _connect_for_test(pyodbc, conn_str: str, timeout: int, key: tuple, endpoint=None) -> None:
+    if test_connections.reuse(key):
+        return
+    # An unreachable (host, port) fails here within the probe timeout instead of
+    # the driver's full login timeout
+    if endpoint is not None:
+        ensure_reachable(endpoint)
+    conn = pyodbc.connect(conn_str, autocommit=True, timeout=timeout)
+    test_connections.remember(key, conn)
+
+
+def _set_field_state(field: QLineEdit, enabled: bool, clear: bool = False) -> None:
+    # Only touch what differs: each setEnabled/clear emits change signals, and a
+    # clear on a non-empty field also reaches _invalidate_test through textChanged.
+    # WA_ForceDisabled is the field's own flag (isEnabled also reflects the parents).
+    if field.testAttribute(Qt.WA_ForceDisabled) == enabled:
+        field.setEnabled(enabled)
+    if clear and field.text():
+        field.clear()
+
+
+def _auth_ui_sql(dlg: MSSQLConnectionDialog) -> None:
+    _set_field_state(dlg.username, True)
+    _set_field_state(dlg.password, True)
+
+
+def _auth_ui_aad_interactive(dlg: MSSQLConnectionDialog) -> None:
+    # Username optional (UPN hint), password not used
+    _set_field_state(dlg.username, True)
+    _set_field_state(dlg.password, False, clear=True)
+
+
+def _auth_ui_aad_integrated(dlg: MSSQLConnectionDialog) -> None:
+    # Pure SSO; no explicit credentials
+    _set_field_state(dlg.username, False, clear=True)
+    _set_field_state(dlg.password, False, clear=True)
+
+
+def _auth_ui_default(dlg: MSSQLConnectionDialog) -> None:
+    # Default safe state
+    _set_field_state(dlg.username, False)
+    _set_field_state(dlg.password, False, clear=True)
+
+
+# Auth combo display name -> field state handler, used by _on_auth_type_changed
+_AUTH_DISPATCH = MappingProxyType({
+    "MS-SQL": _auth_ui_sql,
+    "Azure AD Interactive": _auth_ui_aad_interactive,
+    "Azure AD Integrated": _auth_ui_aad_integrated,
+})
 
 
 class MSSQLConnectionDialog(QDialog):
@@ -20,6 +216,11 @@ class MSSQLConnectionDialog(QDialog):
     Includes a Test Connection button. Passwords are never persisted.
     """
 
+    # Azure AD Interactive error code -> method showing its remedy
+    _AAD_ERROR_HANDLERS = MappingProxyType({
+        "0x534": "_show_driver_fallback_dialog",
+    })
+
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
         self.setWindowTitle("Remote Connection")
@@ -58,261 +259,149 @@ class MSSQLConnectionDialog(QDialog):
         self._test_ok = False
         self._use_driver17 = False  # Track if Driver 17 was successful
         self.btn_ok.setEnabled(False)
-
-        # Wiring
-        self.btn_test.clicked.connect(self.on_test)
-        self.btn_ok.clicked.connect(self.accept)
-        self.btn_cancel.clicked.connect(self.reject)
-        self.auth_type.currentTextChanged.connect(self._on_auth_type_changed)
+        # (raw widget values, parsed descriptor) from the last descriptor() call
+        self._descriptor_cache: tuple[tuple, dict] | None = None
+        # (test key, used Driver 17, expires_at) of the last successful test; kept across
+        # edits so reverting to verified settings doesn't need another round trip
+        self._last_ok: tuple[tuple, bool, float] | None = None
+
+        # Wiring. Widget signals below are only ever emitted on the GUI thread, so
+        # they connect directly (no per-emission thread check); results from the
+        # test worker come back through run_connect_bg's queued invoker instead.
+        self.btn_test.clicked.connect(self.on_test, Qt.DirectConnection)
+        self.btn_ok.clicked.connect(self.accept, Qt.DirectConnection)
+        self.btn_cancel.clicked.connect(self.reject, Qt.DirectConnection)
+        self.auth_type.currentTextChanged.connect(self._on_auth_type_changed, Qt.DirectConnection)
 
         # Invalidate test when fields change
         for w in (self.server, self.database, self.port, self.username, self.password):
-            w.textChanged.connect(self._invalidate_test)
-        self.auth_type.currentTextChanged.connect(self._invalidate_test)
+            w.textChanged.connect(self._invalidate_test, Qt.DirectConnection)
+        self.auth_type.currentTextChanged.connect(self._invalidate_test, Qt.DirectConnection)
 
         # Initialize auth-dependent field state
         self._on_auth_type_changed(self.auth_type.currentText())
 
+        # Periodically close cached test connections that have expired
+        self._sweep_timer = QTimer(self)
+        self._sweep_timer.setInterval(_TEST_CONN_SWEEP_MS)
+        self._sweep_timer.timeout.connect(test_connections.sweep)
+        self._sweep_timer.start()
+
+        # In-flight Test Connection: bumping the generation orphans its callbacks
+        self._test_generation = 0
+        self._test_future = None
+        self.finished.connect(self._cancel_connection_test)
+        # Test handles are only worth keeping while the user can click Test again
+        self.finished.connect(test_connections.clear)
+        self.finished.connect(self._forget_verified_test)
+
+    @Slot(str)
     def _invalidate_test(self, *args) -> None:
+        if self._test_future is not None:
+            # Settings changed mid-test; its result no longer applies
+            self._cancel_connection_test()
+        # Keystroke storms: only the first change after a successful test has anything
+        # to undo. That transition stays synchronous so OK can never be clicked on
+        # settings that were edited after the test.
+        if not self._test_ok and not self._use_driver17:
+            return
         self._test_ok = False
         self._use_driver17 = False  # Reset driver preference when settings change
         self.btn_ok.setEnabled(False)
 
+    @Slot(int)
+    def _forget_verified_test(self, *args) -> None:
+        # The dialog may be reopened later; a verification from this session must
+        # not let its next Test skip the round trip
+        self._last_ok = None
+
+    @Slot(str)
     def _on_auth_type_changed(self, auth: str) -> None:
         # Handle display names from the combo box
-        if auth == "MS-SQL":
-            self.username.setEnabled(True)
-            self.password.setEnabled(True)
-        elif auth == "Azure AD Interactive":
-            # Username optional (UPN hint), password not used
-            self.username.setEnabled(True)
-            self.password.setEnabled(False)
-            self.password.clear()
-        elif auth == "Azure AD Integrated":
-            # Pure SSO; no explicit credentials
-            self.username.setEnabled(False)
-            self.password.setEnabled(False)
-            self.username.clear()
-            self.password.clear()
-        else:
-            # Default safe state
-            self.username.setEnabled(False)
-            self.password.setEnabled(False)
-            self.password.clear()
+        _AUTH_DISPATCH.get(auth, _auth_ui_default)(self)
 
     def descriptor(self) -> dict:
-        # Map display names to internal auth_type values
-        auth_type_mapping = {
-            "MS-SQL": "sql",
-            "Azure AD Interactive": "azure_ad_interactive",
-            "Azure AD Integrated": "azure_ad_integrated"
-        }
-
         display_auth_type = self.auth_type.currentText()
-        internal_auth_type = auth_type_mapping.get(display_auth_type, "sql")
+        server_text = self.server.text()
+        database_text = self.database.text()
+        port_text = self.port.text()
+        username_text = self.username.text()
+
+        # Reuse the last parse while the fields are unchanged; hand out a copy
+        # because callers add keys (e.g. password) to the result
+        key = (server_text, database_text, port_text, display_auth_type, username_text)
+        cached = self._descriptor_cache
+        if cached is not None and cached[0] == key:
+            return dict(cached[1])
+
+        # Map display names to internal auth_type values
+        internal_auth_type = _DISPLAY_TO_AUTH.get(display_auth_type, _AUTH_SQL)
 
         d: dict = {
-            "server": self.server.text().strip(),
-            "database": self.database.text().strip(),
+            "server": server_text.strip(),
+            "database": database_text.strip(),
             "auth_type": internal_auth_type,
         }
         # Optional fields
+        port_stripped = port_text.strip()
         try:
-            port_val = int(self.port.text()) if self.port.text().strip() else None
+            port_val = int(port_text) if port_stripped else None
         except ValueError:
             port_val = None
         if port_val is not None:
             d["port"] = port_val
 
         # Username required for MS-SQL and Azure AD Interactive
-        if internal_auth_type in ("sql", "azure_ad_interactive"):
-            if self.username.text().strip():
-                d["username"] = self.username.text().strip()
+        if internal_auth_type is _AUTH_SQL or internal_auth_type is _AUTH_AAD_INTERACTIVE:
+            username = username_text.strip()
+            if username:
+                d["username"] = username
             # password intentionally not stored in descriptor
-        return d
+        self._descriptor_cache = (key, d)
+        return dict(d)
 
     def descriptor_with_password(self) -> dict:
         """Get descriptor including password for connection testing (never persisted)."""
         d = self.descriptor()
         # Add password only for connection testing - never stored
-        if self.password.text():
-            d["password"] = self.password.text()
+        pwd = self.password.text()
+        if pwd:
+            d["password"] = pwd
         # Add driver preference if Driver 17 was successful
         if self._use_driver17:
             d["use_driver17"] = True
         return d
 
-    def _build_odbc_connection_string(self) -> str:
-        """Attempt to build a DSN-less ODBC connection string for pyodbc.
-        Uses a common SQL Server ODBC driver name; may need adjustment per system.
+    def reset_for_reuse(self) -> None:
+        """Drop the password and any test result before the dialog is shown again.
+
+        Server, database and the other settings are kept for convenience.
         """
-        desc = self.descriptor()
-        kwargs = build_connect_kwargs(desc)
-        parts = []
-        # Prefer modern driver; fallback is environment-specific
-        parts.append("DRIVER={ODBC Driver 18 for SQL Server}")
-        if kwargs.get("Server"):
-            parts.append(f"SERVER={kwargs['Server']}")
-        if kwargs.get("Database"):
-            parts.append(f"DATABASE={kwargs['Database']}")
-
-        mode = (desc.get("auth_type") or "").lower()
-        if mode == "windows" or kwargs.get("Trusted_Connection") == "yes":
-            parts.append("Trusted_Connection=yes")
-        elif mode == "sql":
-            if kwargs.get("UID"):
-                parts.append(f"UID={kwargs['UID']}")
-            pwd = self.password.text()
-            if pwd:
-                parts.append(f"PWD={pwd}")
-        elif mode == "azure_ad_interactive":
-            parts.append("Authentication=ActiveDirectoryInteractive")
-            if kwargs.get("UID"):
-                parts.append(f"UID={kwargs['UID']}")
-            # No password for interactive
-        elif mode == "azure_ad_password":
-            parts.append("Authentication=ActiveDirectoryPassword")
-            if kwargs.get("UID"):
-                parts.append(f"UID={kwargs['UID']}")
-            pwd = self.password.text()
-            if pwd:
-                parts.append(f"PWD={pwd}")
-        elif mode == "azure_ad_integrated":
-            parts.append("Authentication=ActiveDirectoryIntegrated")
-            # No UID/PWD for integrated SSO
-        elif mode == "azure_ad_device_code":
-            parts.append("Authentication=ActiveDirectoryDeviceCode")
-            if kwargs.get("UID"):
-                parts.append(f"UID={kwargs['UID']}")
-            # No password for device code
-        else:
-            # Default to Windows safe behavior
-            parts.append("Trusted_Connection=yes")
+        self.password.clear()
+        self._test_ok = False
+        self._use_driver17 = False
+        self._last_ok = None
+        self.btn_ok.setEnabled(False)
 
-        # Optional Authority/Tenant for AAD modes
-        if mode.startswith("azure_ad") and desc.get("authority"):
-            parts.append(f"Authority={desc['authority']}")
-
-        # Security defaults
-        parts.append("Encrypt=yes")
-        # For Azure AD authentication, trust server certificate to allow browser authentication
-        if mode.startswith("azure_ad"):
-            parts.append("TrustServerCertificate=yes")
-        else:
-            parts.append("TrustServerCertificate=no")
-        # Do not include timeout in the connection string; pass via pyodbc.connect(..., timeout=...)
-        return ";".join(parts)
-
-    def _build_odbc_connection_string_for_desc(self, desc: dict) -> str:
-        """Build ODBC connection string for a provided descriptor (no persistence)."""
-        kwargs = build_connect_kwargs(desc)
-        parts = []
-        parts.append("DRIVER={ODBC Driver 18 for SQL Server}")
-        if kwargs.get("Server"):
-            parts.append(f"SERVER={kwargs['Server']}")
-        if kwargs.get("Database"):
-            parts.append(f"DATABASE={kwargs['Database']}")
-        mode = (desc.get("auth_type") or "").lower()
-        if mode == "windows" or kwargs.get("Trusted_Connection") == "yes":
-            parts.append("Trusted_Connection=yes")
-        elif mode == "sql":
-            if kwargs.get("UID"):
-                parts.append(f"UID={kwargs['UID']}")
-            pwd = self.password.text()
-            if pwd:
-                parts.append(f"PWD={pwd}")
-        elif mode == "azure_ad_interactive":
-            parts.append("Authentication=ActiveDirectoryInteractive")
-            if kwargs.get("UID"):
-                parts.append(f"UID={kwargs['UID']}")
-        elif mode == "azure_ad_password":
-            parts.append("Authentication=ActiveDirectoryPassword")
-            if kwargs.get("UID"):
-                parts.append(f"UID={kwargs['UID']}")
-            pwd = self.password.text()
-            if pwd:
-                parts.append(f"PWD={pwd}")
-        elif mode == "azure_ad_integrated":
-            parts.append("Authentication=ActiveDirectoryIntegrated")
-        elif mode == "azure_ad_device_code":
-            parts.append("Authentication=ActiveDirectoryDeviceCode")
-            if kwargs.get("UID"):
-                parts.append(f"UID={kwargs['UID']}")
-        else:
-            parts.append("Trusted_Connection=yes")
-        # Optional Authority/Tenant for AAD modes
-        if mode.startswith("azure_ad") and desc.get("authority"):
-            parts.append(f"Authority={desc['authority']}")
-        parts.append("Encrypt=yes")
-        # For Azure AD authentication, trust server certificate to allow browser authentication
-        if mode.startswith("azure_ad"):
-            parts.append("TrustServerCertificate=yes")
-        else:
-            parts.append("TrustServerCertificate=no")
-        return ";".join(parts)
-
-    def _build_odbc_connection_string_for_desc_driver17(self, desc: dict) -> str:
-        """Build ODBC connection string using Driver 17 for Azure AD compatibility."""
-        kwargs = build_connect_kwargs(desc)
-        parts = []
-        parts.append("DRIVER={ODBC Driver 17 for SQL Server}")  # Use Driver 17 instead of 18
-        if kwargs.get("Server"):
-            parts.append(f"SERVER={kwargs['Server']}")
-        if kwargs.get("Database"):
-            parts.append(f"DATABASE={kwargs['Database']}")
-        mode = (desc.get("auth_type") or "").lower()
-        if mode == "windows" or kwargs.get("Trusted_Connection") == "yes":
-            parts.append("Trusted_Connection=yes")
-        elif mode == "sql":
-            if kwargs.get("UID"):
-                parts.append(f"UID={kwargs['UID']}")
-            pwd = self.password.text()
-            if pwd:
-                parts.append(f"PWD={pwd}")
-        elif mode == "azure_ad_interactive":
-            parts.append("Authentication=ActiveDirectoryInteractive")
-            if kwargs.get("UID"):
-                parts.append(f"UID={kwargs['UID']}")
-        elif mode == "azure_ad_password":
-            parts.append("Authentication=ActiveDirectoryPassword")
-            if kwargs.get("UID"):
-                parts.append(f"UID={kwargs['UID']}")
-            pwd = self.password.text()
-            if pwd:
-                parts.append(f"PWD={pwd}")
-        elif mode == "azure_ad_integrated":
-            parts.append("Authentication=ActiveDirectoryIntegrated")
-        elif mode == "azure_ad_device_code":
-            parts.append("Authentication=ActiveDirectoryDeviceCode")
-            if kwargs.get("UID"):
-                parts.append(f"UID={kwargs['UID']}")
-        else:
-            parts.append("Trusted_Connection=yes")
-        # Optional Authority/Tenant for AAD modes
-        if mode.startswith("azure_ad") and desc.get("authority"):
-            parts.append(f"Authority={desc['authority']}")
-        parts.append("Encrypt=yes")
-        # For Azure AD authentication, trust server certificate to allow browser authentication
-        if mode.startswith("azure_ad"):
-            parts.append("TrustServerCertificate=yes")
-        else:
-            parts.append("TrustServerCertificate=no")
-        return ";".join(parts)
+    def _build_odbc_connection_string_for_desc(self, desc: dict, pwd: str, driver: str = "18") -> str:
+        """Build ODBC connection string for a provided descriptor and password (no persistence)."""
+        return _odbc_conn_str(desc, pwd, driver)
 
+    @Slot()
     def on_test(self) -> None:  # pragma: no cover - UI interaction
         # First, validate inputs/map to kwargs
+        # Snapshot the password once; workers must not read widgets
+        pwd = self.password.text()
         try:
             desc = self.descriptor()
-            kwargs = build_connect_kwargs(desc)
-            if not kwargs.get("Server") or not kwargs.get("Database"):
+            if not desc["server"] or not desc["database"]:
                 raise ValueError("Server and Database are required")
-            mode = (desc.get("auth_type") or "").lower()
-            if mode == "sql":
-                if not desc.get("username") or not self.password.text():
-                    raise ValueError("Username and Password are required for MS-SQL authentication")
-            elif mode == "azure_ad_interactive":
-                if not desc.get("username"):
-                    raise ValueError("Username is required for Azure AD Interactive authentication")
+            kwargs = build_connect_kwargs(desc)
+            required = _TEST_REQUIREMENTS.get(desc["auth_type"])
+            if required is not None:
+                needs_user, needs_pwd, message = required
+                if (needs_user and not desc.get("username")) or (needs_pwd and not pwd):
+                    raise ValueError(message)
         except Exception as exc:  # show actionable message with details
             box = QMessageBox(self)
             box.setIcon(QMessageBox.Warning)
@@ -326,78 +415,113 @@ class MSSQLConnectionDialog(QDialog):
             box.exec()
             return
 
+        # Same settings and password as a recent successful test: nothing to re-check
+        last_ok = self._last_ok
+        if (last_ok is not None and time.monotonic() < last_ok[2]
+                and last_ok[0] == _test_conn_cache_key(desc, "18", pwd)):
+            self._test_ok = True
+            self._use_driver17 = last_ok[1]
+            self.btn_ok.setEnabled(True)
+            QMessageBox.information(self, "Test Connection", "Previously verified; these settings connected successfully.")
+            return
+
         # Run connection test in background thread to prevent UI freezing
-        self._run_connection_test_async(desc, kwargs)
+        # Build the connection string once, on the UI thread, and hand it to the worker
+        conn_str = self._build_odbc_connection_string_for_desc(desc, pwd)
+        self._run_connection_test_async(desc, kwargs, conn_str, pwd)
 
-    def _run_connection_test_async(self, desc: dict, kwargs: dict) -> None:
+    def _run_connection_test_async(self, desc: dict, kwargs: dict, conn_str: str, pwd: str) -> None:
         """Run connection test in background thread to prevent UI freezing"""
-        from src.services.background_runner import run_bg
-
         # Disable test button during test
         self.btn_test.setEnabled(False)
         self.btn_test.setText("Testing...")
+        generation = self._start_connection_test()
 
         def test_work():
-            return self._perform_connection_test(desc, kwargs)
+            return self._perform_connection_test(desc, kwargs, conn_str, pwd)
 
         def on_success(result):
-            self.btn_test.setEnabled(True)
-            self.btn_test.setText("Test Connection")
+            if not self._finish_connection_test(generation):
+                return
             QMessageBox.information(self, "Test Connection", result)
             # Gate passed
             self._test_ok = True
             self.btn_ok.setEnabled(True)
+            self._remember_test_ok(desc, pwd, driver17=False)
 
         def on_error(exc):
-            self.btn_test.setEnabled(True)
-            self.btn_test.setText("Test Connection")
+            if not self._finish_connection_test(generation):
+                return
             # Show error dialog on UI thread
             self._show_connection_error_dialog(desc, exc)
 
-        run_bg(test_work, on_result=on_success, on_error=on_error)
+        self._test_future = run_connect_bg(test_work, on_result=on_success, on_error=on_error)
+
+    def _remember_test_ok(self, desc: dict, pwd: str, driver17: bool) -> None:
+        # Keyed like on_test's lookup (Driver 18 identity); the flag restores the fallback
+        key = _test_conn_cache_key(desc, "18", pwd)
+        self._last_ok = (key, driver17, time.monotonic() + TEST_CONN_TTL_SECONDS)
+
+    def _start_connection_test(self) -> int:
+        """Cancel any in-flight test and return the generation of the new one."""
+        self._cancel_connection_test()
+        # The dialog stays interactive (edits cancel the test); the cursor shows it is working
+        self.setCursor(Qt.BusyCursor)
+        return self._test_generation
+
+    def _finish_connection_test(self, generation: int) -> bool:
+        """Restore the Test button; False if the test was cancelled or the dialog is gone."""
+        if not shiboken6.isValid(self) or generation != self._test_generation:
+            return False
+        self._test_future = None
+        self.unsetCursor()
+        self.btn_test.setEnabled(True)
+        self.btn_test.setText("Test Connection")
+        return True
+
+    @Slot(int)
+    def _cancel_connection_test(self, *args) -> None:
+        # pyodbc.connect cannot be interrupted: a queued test is dropped, a running one
+        # finishes on its worker but its result is ignored
+        self._test_generation += 1
+        fut, self._test_future = self._test_future, None
+        if fut is not None:
+            fut.cancel()
+            self.unsetCursor()
+            self.btn_test.setEnabled(True)
+            self.btn_test.setText("Test Connection")
 
-    def _perform_connection_test(self, desc: dict, kwargs: dict) -> str:
+    def _perform_connection_test(self, desc: dict, kwargs: dict, conn_str: str, pwd: str) -> str:
         """Perform the actual connection test (runs in background thread)"""
-        try:
-            import pyodbc  # type: ignore
-        except ImportError:
+        mode = sys.intern((desc.get("auth_type") or "").lower())
+        pyodbc = _get_pyodbc()
+        if pyodbc is None:
             # Fallback behavior without pyodbc installed
-            mode = (desc.get("auth_type") or "").lower()
-            extra = " Using Windows Authentication (no credential prompt)." if mode == "windows" else ""
+            extra = " Using Windows Authentication (no credential prompt)." if mode is _AUTH_WINDOWS else ""
             return "Connection settings look OK. Install 'pyodbc' to perform a live test." + extra
 
-        conn_str = self._build_odbc_connection_string()
-
         # Use shorter timeout for test to prevent hanging
         timeout_sec = min(10, kwargs.get("Timeout", 5))  # Max 10 seconds
-        with pyodbc.connect(conn_str, autocommit=True, timeout=timeout_sec) as _conn:  # noqa: F841
-            pass
+        key = _test_conn_cache_key(desc, "18", pwd)
+        # Azure AD logins may be redirected by the gateway, so only probe the others
+        endpoint = None if mode in _AZURE_AD_MODES else sql_server_endpoint(desc["server"], desc.get("port"))
+        _connect_for_test(pyodbc, conn_str, timeout_sec, key, endpoint)
 
         # Windows auth does not prompt; it uses your current Windows account
         msg = "Connection succeeded."
-        if self.auth_type.currentText().lower() == "windows":
+        if mode is _AUTH_WINDOWS:
             msg += " Using Windows Authentication (no credential prompt)."
         return msg
 
     def _show_connection_error_dialog(self, desc: dict, exc: BaseException) -> None:
         """Show connection error dialog on UI thread"""
-        from src.services.mssql_connection import map_exception
-        # Handle ModuleNotFoundError case
-        if isinstance(exc, ModuleNotFoundError):
-            # Fallback behavior without pyodbc installed
-            extra = " Using Windows Authentication (no credential prompt)." if self.auth_type.currentText().lower() == "windows" else ""
-            QMessageBox.information(
-                self,
-                "Test Connection",
-                "Connection settings look OK. Install 'pyodbc' to perform a live test." + extra,
-            )
-            return
-
-        # Check for Azure AD Interactive 0x534 error that can be resolved with Driver 17
-        error_str = str(exc)
-        if "0x534" in error_str and desc.get("auth_type") == "azure_ad_interactive":
-            self._show_driver_fallback_dialog(desc, exc)
-            return
+        # Azure AD Interactive errors with a dedicated remedy (e.g. 0x534 -> retry with Driver 17)
+        if desc.get("auth_type") == "azure_ad_interactive":
+            for code in driver_error_codes(exc):
+                handler = self._AAD_ERROR_HANDLERS.get(code)
+                if handler is not None:
+                    getattr(self, handler)(desc, exc)
+                    return
 
         # Show error dialog with details
         box = QMessageBox(self)
@@ -415,8 +539,6 @@ class MSSQLConnectionDialog(QDialog):
 
     def _show_driver_fallback_dialog(self, desc: dict, exc: BaseException) -> None:
         """Show Azure AD 0x534 error dialog with option to retry with Driver 17"""
-        from PySide6.QtWidgets import QMessageBox, QPushButton
-
         box = QMessageBox(self)
         box.setIcon(QMessageBox.Warning)
         box.setWindowTitle("Test Connection")
@@ -450,22 +572,29 @@ class MSSQLConnectionDialog(QDialog):
 
     def _retry_with_driver17(self, desc: dict) -> None:
         """Retry connection test using ODBC Driver 17"""
-        from src.services.background_runner import run_bg
+        # Built on the UI thread; the worker only connects
+        pwd = self.password.text()
+        conn_str = self._build_odbc_connection_string_for_desc(desc, pwd, driver="17")
 
         def test_work():
             """Test connection with Driver 17 (runs in background thread)"""
+            pyodbc = _get_pyodbc()
+            if pyodbc is None:
+                return "pyodbc is not installed"
             try:
-                import pyodbc
-                conn_str = self._build_odbc_connection_string_for_desc_driver17(desc)
                 timeout_sec = 10  # Max 10 seconds for test
-                with pyodbc.connect(conn_str, autocommit=True, timeout=timeout_sec):
-                    pass
+                key = _test_conn_cache_key(desc, "17", pwd)
+                _connect_for_test(pyodbc, conn_str, timeout_sec, key)
                 return "success"
             except Exception as e:
                 return str(e)
 
+        generation = self._start_connection_test()
+
         def on_complete(result):
             """Handle test completion (runs on UI thread)"""
+            if not self._finish_connection_test(generation):
+                return
             if result == "success":
                 QMessageBox.information(
                     self,
@@ -477,6 +606,7 @@ class MSSQLConnectionDialog(QDialog):
                 self._test_ok = True
                 self._use_driver17 = True
                 self.btn_ok.setEnabled(True)
+                self._remember_test_ok(desc, pwd, driver17=True)
             else:
                 QMessageBox.critical(
                     self,
@@ -486,5 +616,4 @@ class MSSQLConnectionDialog(QDialog):
                 )
 
         # Run test in background
-        run_bg(test_work, on_result=on_complete)
-
+        self._test_future = run_connect_bg(test_work, on_result=on_complete)
@@ -4,9 +4,9 @@ Dialog for handling schema validation results and user choices.
 
 from __future__ import annotations
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, Signal, Slot
 from PySide6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QTextEdit, 
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPlainTextEdit, 
     QPushButton, QMessageBox, QDialogButtonBox
 )
 
@@ -64,7 +64,7 @@ class SchemaValidationDialog(QDialog):
             details_label.setStyleSheet("font-weight: bold; margin-top: 10px;")
             layout.addWidget(details_label)
             
-            details_edit = QTextEdit()
+            details_edit = QPlainTextEdit()
             details_edit.setPlainText(details_text)
             details_edit.setReadOnly(True)
             details_edit.setMaximumHeight(200)
@@ -123,36 +123,31 @@ class SchemaValidationDialog(QDialog):
         if self.validation_result.is_valid:
             return "All required tables are present and match the expected schema."
         
-        # Build deviation details
-        details = []
-        
-        if self.validation_result.missing_tables:
-            details.append("Missing Tables:")
-            for table in self.validation_result.missing_tables:
-                details.append(f"  • {table}")
-            details.append("")
-        
-        if self.validation_result.extra_tables:
-            details.append("Extra Tables (not in azure.sql):")
-            for table in self.validation_result.extra_tables:
-                details.append(f"  • {table}")
-            details.append("")
-        
-        if self.validation_result.table_deviations:
-            details.append("Table Schema Deviations:")
-            for table_name, deviations in self.validation_result.table_deviations.items():
-                details.append(f"  {table_name}:")
-                for deviation in deviations:
-                    details.append(f"    - {deviation}")
-            details.append("")
-        
-        if not details:
+        # Build deviation details: one string per section, blank line between sections
+        result = self.validation_result
+        sections = []
+        
+        if result.missing_tables:
+            sections.append("Missing Tables:\n" + "\n".join(f"  • {table}" for table in result.missing_tables))
+        
+        if result.extra_tables:
+            sections.append("Extra Tables (not in azure.sql):\n"
+                            + "\n".join(f"  • {table}" for table in result.extra_tables))
+        
+        if result.table_deviations:
+            sections.append("Table Schema Deviations:\n" + "\n".join(
+                f"  {table_name}:" + "".join(f"\n    - {deviation}" for deviation in deviations)
+                for table_name, deviations in result.table_deviations.items()
+            ))
+        
+        if not sections:
             return "No specific issues detected."
         
-        details.append("Proceeding with these deviations may cause application errors or data inconsistencies.")
+        sections.append("Proceeding with these deviations may cause application errors or data inconsistencies.")
         
-        return "\n".join(details)
+        return "\n\n".join(sections)
     
+    @Slot()
     def _on_deploy(self):
         """User chose to deploy schema"""
         # Confirm deployment
@@ -169,6 +164,7 @@ class SchemaValidationDialog(QDialog):
             self.user_choice = 'deploy'
             self.accept()
     
+    @Slot()
     def _on_proceed(self):
         """User chose to proceed despite issues"""
         if not self.validation_result.is_valid and not self.validation_result.has_no_tables:
@@ -189,6 +185,7 @@ class SchemaValidationDialog(QDialog):
         self.user_choice = 'proceed'
         self.accept()
     
+    @Slot()
     def _on_cancel(self):
         """User chose to cancel"""
         self.user_choice = 'cancel'
@@ -197,6 +194,9 @@ class SchemaValidationDialog(QDialog):
 
 class SchemaDeploymentProgressDialog(QDialog):
     """Simple progress dialog for schema deployment"""
+
+    # Emit from worker threads; delivered to update_status on the UI thread
+    statusChanged = Signal(str)
     
     def __init__(self, parent):
         super().__init__(parent)
@@ -214,8 +214,12 @@ class SchemaDeploymentProgressDialog(QDialog):
         self.status_label.setAlignment(Qt.AlignCenter)
         self.status_label.setStyleSheet("color: gray;")
         layout.addWidget(self.status_label)
+
+        self.statusChanged.connect(self.update_status, Qt.QueuedConnection)
     
+    @Slot(str)
     def update_status(self, status: str):
         """Update the status message"""
+        # setText schedules a coalesced repaint; deployment runs off the UI thread,
+        # so the event loop is free to paint without forcing it here
         self.status_label.setText(status)
-        self.repaint()  # Force immediate update
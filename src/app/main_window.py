@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import os
+
 from PySide6.QtWidgets import (
     QMainWindow,
     QWidget,
     QVBoxLayout,
     QHBoxLayout,
     QListWidget,
+    QListWidgetItem,
     QPushButton,
     QTextEdit,
     QLabel,
@@ -13,9 +16,11 @@ from PySide6.QtWidgets import (
     QMenu,
     QMenuBar,
 )
-from PySide6.QtCore import Qt, QTimer, QPoint
+from PySide6.QtCore import Qt, QTimer, QPoint, Slot
 from PySide6.QtGui import QPalette, QAction
 
+from src.services.recent_projects import MAX_RECENT
+
 
 class MainWindow(QMainWindow):
     """Main application window with Startup view for M1.
@@ -121,6 +126,28 @@ class MainWindow(QMainWindow):
         except Exception:
             pass
 
+    def add_recent_top(self, entry: dict) -> None:
+        """Move/insert a single entry at the top instead of rebuilding the whole list."""
+        path = entry.get("path", "")
+        self._take_recent_rows(path)
+        self.recent_list.insertItem(0, path)
+        while self.recent_list.count() > MAX_RECENT:
+            self.recent_list.takeItem(self.recent_list.count() - 1)
+        self.recent_list.clearSelection()
+        self.recent_list.setCurrentRow(-1)
+
+    def remove_recent(self, path: str) -> None:
+        """Remove the row(s) for a single path without rebuilding the list."""
+        self._take_recent_rows(path)
+
+    def _take_recent_rows(self, path: str) -> None:
+        # Same case-insensitive, absolute-path matching as RecentProjectsService
+        key = os.path.normcase(os.path.abspath(path))
+        for row in range(self.recent_list.count() - 1, -1, -1):
+            if os.path.normcase(os.path.abspath(self.recent_list.item(row).text())) == key:
+                self.recent_list.takeItem(row)
+
+    @Slot(QListWidgetItem)
     def _on_recent_item_activated(self, item) -> None:  # pragma: no cover - UI wiring stub
         if item is None or self._controller is None:
             return
@@ -159,6 +186,7 @@ class MainWindow(QMainWindow):
         # Show progress dialog only if busy for >= 1s
         self._busy_timer.start(1000)
 
+    @Slot()
     def _on_busy_timer(self) -> None:  # pragma: no cover - exercised via integration test
         if not self._busy:
             return
@@ -184,6 +212,7 @@ class MainWindow(QMainWindow):
         """Check if the UI is currently in busy state"""
         return self._busy
 
+    @Slot(QPoint)
     def _on_recent_context_menu(self, pos: QPoint) -> None:  # pragma: no cover - UI interaction
         if not self._controller:
             return
@@ -3,13 +3,15 @@ from __future__ import annotations
 import sys
 from PySide6.QtWidgets import QApplication
 
-from src.app.main_window import MainWindow
-from src.app.controllers.startup_controller import StartupController
-
 
 def main() -> int:
     app = QApplication.instance() or QApplication(sys.argv)
 
+    # Imported once the application exists: the window, controller and the
+    # dialog/service modules they pull in are not needed to construct QApplication
+    from src.app.main_window import MainWindow
+    from src.app.controllers.startup_controller import StartupController
+
     controller = StartupController()
     win = MainWindow()
     controller.attach_view(win)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
@@ -10,6 +11,16 @@ from src.services.db_adapters.sqlite_adapter import SqliteAdapter
 from src.services.db_adapters.mssql_adapter import MssqlAdapter
 
 
+# Settings rows that make up a remote project's connection descriptor
+_REMOTE_DESCRIPTOR_KEYS = (
+    "remote_server", "remote_database", "remote_auth_type", "remote_username",
+    "remote_authority", "remote_port", "remote_timeout_seconds", "remote_use_driver17",
+)
+_REMOTE_DESCRIPTOR_SQL = "SELECT key, value FROM settings WHERE key IN ({})".format(
+    ",".join("?" * len(_REMOTE_DESCRIPTOR_KEYS))
+)
+
+
 @dataclass
 class ProjectRuntime:
     sqlite_path: Path
@@ -28,6 +39,10 @@ class AppContext:
         self._project: Optional[ProjectRuntime] = None
         self._gateway: Optional[DatabaseGateway] = None
         self._pending_schema_validation: Optional[dict] = None
+        # Long-lived handle for settings reads/writes of the active project; keeps
+        # SQLite's page and statement caches warm instead of reconnecting per lookup
+        self._settings_conn: Optional[sqlite3.Connection] = None
+        self._settings_lock = threading.Lock()
 
     @property
     def project(self) -> Optional[ProjectRuntime]:
@@ -47,6 +62,15 @@ class AppContext:
             except Exception:
                 pass  # Ignore cleanup errors
 
+        with self._settings_lock:
+            if self._settings_conn is not None:
+                try:
+                    self._settings_conn.close()
+                except Exception:
+                    pass
+                finally:
+                    self._settings_conn = None
+
         if self._gateway is not None:
             try:
                 self._gateway.close()
@@ -81,7 +105,7 @@ class AppContext:
 
             # For SQL authentication, get password from secure credential manager
             password = None
-            if auth_type.lower() == "sql":
+            if auth_type == "sql":
                 from src.services.secure_credential_manager import get_credential_manager
                 credential_manager = get_credential_manager()
                 password = credential_manager.get_password(str(p))
@@ -171,11 +195,12 @@ class AppContext:
     # Internal helpers -------------------------------------------------
     def _read_storage_mode(self, path: Path) -> Optional[str]:
         try:
-            with sqlite3.connect(path) as conn:
-                conn.row_factory = sqlite3.Row
-                cur = conn.execute("SELECT value FROM settings WHERE key='storage_mode'")
-                row = cur.fetchone()
-                return (row[0] if row else None) or None
+            conn = sqlite3.connect(path)
+            try:
+                row = conn.execute("SELECT value FROM settings WHERE key='storage_mode'").fetchone()
+            finally:
+                conn.close()
+            return (row[0] if row else None) or None
         except Exception:
             return None
 
@@ -186,25 +211,27 @@ class AppContext:
         timeout = 30
         use_driver17 = False
         try:
-            with sqlite3.connect(path) as conn:
-                conn.row_factory = sqlite3.Row
-                def _get(k: str) -> Optional[str]:
-                    r = conn.execute("SELECT value FROM settings WHERE key=?", (k,)).fetchone()
-                    return r[0] if r else None
-                server = _get("remote_server") or ""
-                database = _get("remote_database") or ""
-                auth_type = (_get("remote_auth_type") or "windows").lower()
-                username = _get("remote_username") or ""
-                authority = _get("remote_authority") or ""
-                p = _get("remote_port")
-                if p and str(p).isdigit():
-                    port = int(p)
-                t = _get("remote_timeout_seconds")
-                if t and str(t).isdigit():
-                    timeout = int(t)
-                d17 = _get("remote_use_driver17")
-                if d17 and str(d17) in ("1", "true", "True"):
-                    use_driver17 = True
+            conn = sqlite3.connect(path)
+            try:
+                # One query for all remote keys; plain tuples go straight into the dict
+                rows = conn.execute(_REMOTE_DESCRIPTOR_SQL, _REMOTE_DESCRIPTOR_KEYS).fetchall()
+            finally:
+                conn.close()
+            values = dict(rows)
+            server = values.get("remote_server") or ""
+            database = values.get("remote_database") or ""
+            auth_type = (values.get("remote_auth_type") or "windows").lower()
+            username = values.get("remote_username") or ""
+            authority = values.get("remote_authority") or ""
+            p = values.get("remote_port")
+            if p and str(p).isdigit():
+                port = int(p)
+            t = values.get("remote_timeout_seconds")
+            if t and str(t).isdigit():
+                timeout = int(t)
+            d17 = values.get("remote_use_driver17")
+            if d17 and str(d17) in ("1", "true", "True"):
+                use_driver17 = True
         except Exception:
             pass
         # Embed port into server if provided (e.g., server,port)
@@ -212,24 +239,31 @@ class AppContext:
             server = f"{server},{port}"
         return server, database, auth_type, username, authority, timeout, use_driver17
 
+    def _get_settings_conn(self) -> sqlite3.Connection:
+        # Caller holds _settings_lock; the handle is shared by the UI and worker threads
+        if self._settings_conn is None:
+            self._settings_conn = sqlite3.connect(self._project.sqlite_path, check_same_thread=False)
+        return self._settings_conn
+
     # Public settings helpers -----------------------------------------
     def get_setting(self, key: str, default: Optional[str] = None) -> Optional[str]:
         if not self._project:
             return default
         try:
-            with sqlite3.connect(self._project.sqlite_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._settings_lock:
+                conn = self._get_settings_conn()
                 row = conn.execute("SELECT value FROM settings WHERE key=?", (key,)).fetchone()
-                return (row[0] if row else None) or default
+            return (row[0] if row else None) or default
         except Exception:
             return default
 
     def set_setting(self, key: str, value: str) -> None:
         if not self._project:
             raise RuntimeError("No project loaded")
-        with sqlite3.connect(self._project.sqlite_path) as conn:
-            conn.execute("INSERT OR REPLACE INTO settings(key, value) VALUES(?, ?)", (key, value))
-            conn.commit()
+        with self._settings_lock:
+            conn = self._get_settings_conn()
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO settings(key, value) VALUES(?, ?)", (key, value))
 
 
 
@@ -6,12 +6,15 @@ Follows Microsoft OAuth 2.0 best practices for desktop applications.
 """
 
 from __future__ import annotations
+import sys
 import threading
 import time
 from dataclasses import dataclass
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 
+from src.services.odbc_pool import load_pyodbc
+
 
 @dataclass
 class AuthToken:
@@ -33,7 +36,7 @@ class AuthToken:
         return max(0, int(delta.total_seconds()))
 
 
-@dataclass
+@dataclass(slots=True)
 class ConnectionDescriptor:
     """Azure AD connection parameters"""
     server: str
@@ -43,6 +46,10 @@ class ConnectionDescriptor:
     authority: Optional[str] = None
     timeout_seconds: int = 30
     use_driver17: bool = False  # For Azure AD Driver 17 fallback
+
+    def __post_init__(self) -> None:
+        # Normalize once so callers can compare auth_type without re-lowercasing
+        self.auth_type = sys.intern((self.auth_type or "").lower())
     
     def cache_key(self) -> str:
         """Generate unique cache key for this connection"""
@@ -81,6 +88,13 @@ class AzureADTokenManager:
 
         cache_key = descriptor.cache_key()
 
+        # A still-valid token from an earlier authentication (e.g. a connection test or a
+        # previous open of the same project) is reused instead of re-running the auth flow
+        with self._lock:
+            token = self._token_cache.get(cache_key)
+            if token is not None and not token.is_expired:
+                return True
+
         try:
             if descriptor.auth_type == "azure_ad_interactive":
                 success = self._perform_interactive_auth_and_cache(descriptor)
@@ -122,7 +136,7 @@ class AzureADTokenManager:
         Perform Azure AD Interactive authentication and cache the result.
         Must run in main thread to show browser window.
         """
-        import pyodbc
+        pyodbc = load_pyodbc()
 
         # Build connection string for interactive auth
         conn_str = self._build_base_connection_string(descriptor)
@@ -160,7 +174,7 @@ class AzureADTokenManager:
 
     def _try_driver_17_fallback(self, descriptor: ConnectionDescriptor) -> bool:
         """Try authentication with ODBC Driver 17 as fallback for 0x534 errors"""
-        import pyodbc
+        pyodbc = load_pyodbc()
 
         # Build connection string with Driver 17
         conn_str = "DRIVER={ODBC Driver 17 for SQL Server}"
@@ -234,7 +248,7 @@ class AzureADTokenManager:
         Perform Azure AD Interactive authentication using pyodbc.
         This will show the browser window for user login.
         """
-        import pyodbc
+        pyodbc = load_pyodbc()
         
         # Build connection string for interactive auth
         conn_str = self._build_base_connection_string(descriptor)
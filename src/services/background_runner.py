@@ -3,12 +3,18 @@ from __future__ import annotations
 from concurrent.futures import ThreadPoolExecutor, Future
 from typing import Callable, Optional, Any
 
-from PySide6.QtCore import QTimer, QObject, Signal, QMetaObject, Qt
+from PySide6.QtCore import QTimer, QObject, Signal, QMetaObject, Qt, QCoreApplication
 
 
 # Simple global thread pool for background tasks that must not block the UI
 _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="bg")
 
+# Connection tests get their own long-lived workers: a login stuck on its timeout
+# never delays project loads, and repeated Test clicks reuse the same threads
+_connect_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cpd-bg")
+
+_shutdown_hooked = False
+
 
 class _UiInvoker(QObject):
     """Helper QObject that lives on the UI thread to marshal callbacks safely."""
@@ -45,6 +51,22 @@ def _on_ui(cb: Callable[[], None]) -> None:
     _invoke_target.callback_signal.emit(cb)
 
 
+def _shutdown_executors() -> None:
+    # Queued work is dropped; running tasks finish on their own (no join on quit)
+    for executor in (_executor, _connect_executor):
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _hook_shutdown() -> None:
+    global _shutdown_hooked
+    if _shutdown_hooked:
+        return
+    app = QCoreApplication.instance()
+    if app is not None:
+        app.aboutToQuit.connect(_shutdown_executors)
+        _shutdown_hooked = True
+
+
 def run_bg(
     fn: Callable[[], Any],
     *,
@@ -57,7 +79,27 @@ def run_bg(
     - on_result: called on the UI thread with the return value
     - on_error: called on the UI thread with the exception if fn raises
     """
-    fut: Future = _executor.submit(fn)
+    return _submit(_executor, fn, on_result, on_error)
+
+
+def run_connect_bg(
+    fn: Callable[[], Any],
+    *,
+    on_result: Optional[Callable[[Any], None]] = None,
+    on_error: Optional[Callable[[BaseException], None]] = None,
+) -> Future:
+    """Like run_bg, but on the dedicated connection-test pool."""
+    return _submit(_connect_executor, fn, on_result, on_error)
+
+
+def _submit(
+    executor: ThreadPoolExecutor,
+    fn: Callable[[], Any],
+    on_result: Optional[Callable[[Any], None]],
+    on_error: Optional[Callable[[BaseException], None]],
+) -> Future:
+    _hook_shutdown()
+    fut: Future = executor.submit(fn)
 
     def _done_cb(f: Future) -> None:
         try:
@@ -12,6 +12,7 @@ from src.services.database_gateway import (
     map_mssql_error,
 )
 from src.services.mssql_connection import build_connect_kwargs
+from src.services.odbc_pool import load_pyodbc
 from src.services.azure_ad_token_manager import get_token_manager, ConnectionDescriptor
 
 
@@ -139,7 +140,7 @@ class MssqlAdapter(DatabaseGateway):
 
             timeout = max(1, int(self._cfg.timeout_seconds or 30))
             try:
-                import pyodbc  # type: ignore
+                pyodbc = load_pyodbc()
             except Exception as exc:
                 raise DatabaseError(f"pyodbc not available: {exc}")
             return pyodbc.connect(conn_str, autocommit=autocommit, timeout=timeout)
@@ -166,7 +167,7 @@ class MssqlAdapter(DatabaseGateway):
             conn_str = token_manager.get_connection_string(descriptor)
 
             timeout = max(1, int(self._cfg.timeout_seconds or 30))
-            import pyodbc  # type: ignore
+            pyodbc = load_pyodbc()
             conn = pyodbc.connect(conn_str, autocommit=autocommit, timeout=timeout)
             return conn
 
@@ -354,7 +355,7 @@ class MssqlAdapter(DatabaseGateway):
                 health_check_timeout = min(5, health_check_timeout)
 
             try:
-                import pyodbc  # type: ignore
+                pyodbc = load_pyodbc()
             except Exception as exc:
                 raise DatabaseError(f"pyodbc not available: {exc}")
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import cached_property
 from pathlib import Path
 from typing import Optional
 
@@ -20,7 +21,7 @@ class MigrationRunner:
     def begin(self) -> None:
         # In a full implementation, create a pre-migration backup file alongside the DB
         self.recovery_marker = True
-        self.backup_path = self._compute_backup_path()
+        self.backup_path = self._backup_target
 
     def abort_or_finish(self) -> None:
         # For M1 tests, it's sufficient to keep attributes present after lifecycle.
@@ -28,6 +29,11 @@ class MigrationRunner:
         pass
 
     # Internal -------------------------------------------------------
+    @cached_property
+    def _backup_target(self) -> Path:
+        # db_path is fixed at construction, so the backup location only needs computing once
+        return self._compute_backup_path()
+
     def _compute_backup_path(self) -> Path:
         p = self.db_path
         if p.suffix:
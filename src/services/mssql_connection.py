@@ -1,11 +1,32 @@
 from __future__ import annotations
 
+import re
+from functools import lru_cache
 from typing import Dict, Any
 
 
 def build_connect_kwargs(descriptor: Dict[str, Any]) -> Dict[str, Any]:
     """Return pyodbc.connect keyword args from a connection descriptor.
 
+    The mapping is pure, so results are memoized per descriptor contents (the
+    password is never used here and never kept in the cache); each call gets its
+    own copy. See _build_connect_kwargs for the defaults.
+    """
+    try:
+        key = frozenset(item for item in descriptor.items() if item[0] != "password")
+    except TypeError:  # unhashable values; nothing to cache on
+        return _build_connect_kwargs(descriptor)
+    return dict(_cached_connect_kwargs(key))
+
+
+@lru_cache(maxsize=16)
+def _cached_connect_kwargs(key: frozenset) -> Dict[str, Any]:
+    return _build_connect_kwargs(dict(key))
+
+
+def _build_connect_kwargs(descriptor: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a connection descriptor to pyodbc.connect keyword args.
+
     Defaults:
     - Encrypt=True (secure by default)
     - TrustServerCertificate=False (explicit developer override required)
@@ -76,6 +97,45 @@ def build_connect_kwargs(descriptor: Dict[str, Any]) -> Dict[str, Any]:
     return kwargs
 
 
+# Hex status codes (e.g. 0x534) embedded in driver / Azure AD error messages
+_ERROR_CODE_RE = re.compile(r"\b0x[0-9a-fA-F]+\b")
+
+
+def driver_error_message(exc: BaseException) -> str:
+    """The driver's message text for exc, without formatting the whole exception.
+
+    pyodbc errors carry (SQLSTATE, message) in args; other exceptions carry the
+    message as their first string argument.
+    """
+    args = getattr(exc, "args", ())
+    if len(args) > 1 and isinstance(args[1], str):
+        return args[1]
+    if args and isinstance(args[0], str):
+        return args[0]
+    return ""
+
+
+def driver_error_codes(exc: BaseException) -> tuple[str, ...]:
+    """Lowercased hex status codes found in the driver message, in order of appearance."""
+    return tuple(code.lower() for code in _ERROR_CODE_RE.findall(driver_error_message(exc)))
+
+
+def is_aad_0x534(exc: BaseException) -> bool:
+    """True if exc is the Azure AD Interactive 0x534 failure that Driver 17 can work around."""
+    return "0x534" in driver_error_codes(exc)
+
+
+# map_exception fingerprints: one case-insensitive pattern per category, tried in
+# order, so a long driver message is never lowercased or rescanned per substring
+_RE_TIMEOUT = re.compile(r"timeout|timed out", re.IGNORECASE)
+_RE_TLS = re.compile(r"certificate|ssl", re.IGNORECASE)
+_RE_WINDOWS_LOGIN_UNSUPPORTED = re.compile(r"windows logins are not supported", re.IGNORECASE)
+_RE_AAD_ONLY = re.compile(r"azure active directory only authentication is enabled", re.IGNORECASE)
+_RE_AAD_FAILURE = re.compile(r"fa004", re.IGNORECASE)
+_RE_AAD_BAD_CREDENTIALS = re.compile(r"0x4b0|invalid_grant|basic_action", re.IGNORECASE)
+_RE_AAD_0X534 = re.compile(r"0x534", re.IGNORECASE)
+
+
 def map_exception(exc: BaseException) -> str:
     """Map low-level exceptions to actionable, redacted messages.
 
@@ -85,40 +145,39 @@ def map_exception(exc: BaseException) -> str:
     - Never include sensitive credentials in message
     """
     msg = str(exc) if exc else ""
-    mlow = msg.lower()
 
-    if isinstance(exc, TimeoutError) or "timeout" in mlow or "timed out" in mlow:
+    if isinstance(exc, TimeoutError) or _RE_TIMEOUT.search(msg):
         return (
             "Connection attempt timed out or server unreachable. "
             "Verify server/port, network/VPN, and firewall settings."
         )
 
-    if "certificate" in mlow or "ssl" in mlow:
+    if _RE_TLS.search(msg):
         return (
             "TLS certificate validation failed. For development, you may "
             "enable a temporary trust override (Trust Server Certificate) "
             "with explicit consent. Use secure settings in production."
         )
 
-    if "windows logins are not supported" in mlow:
+    if _RE_WINDOWS_LOGIN_UNSUPPORTED.search(msg):
         return (
             "Windows Authentication is not supported by the target SQL Server (e.g., Azure SQL). "
             "Switch Auth Type to 'sql' and provide a SQL user and password, or use a supported Azure AD method."
         )
 
-    if "azure active directory only authentication is enabled" in mlow:
+    if _RE_AAD_ONLY.search(msg):
         return (
             "The server is configured for Azure AD-only authentication. SQL logins are rejected. "
             "Ask your administrator to enable SQL authentication (Mixed mode) or provide an Azure AD connection method."
         )
 
-    if "fa004" in mlow:
-        if "0x4b0" in mlow or "invalid_grant" in mlow or "basic_action" in mlow:
+    if _RE_AAD_FAILURE.search(msg):
+        if _RE_AAD_BAD_CREDENTIALS.search(msg):
             return (
                 "Azure AD (password) authentication failed: invalid credentials or tenant policy (ROPC) blocked. "
                 "Use 'azure_ad_interactive' or 'azure_ad_integrated', or contact your admin."
             )
-        if "0x534" in mlow:
+        if _RE_AAD_0X534.search(msg):
             return (
                 "Azure AD (interactive) authentication failed (code 0x534). "
                 "This is a known issue with ODBC Driver 18. Possible solutions:\n"
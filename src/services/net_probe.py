@@ -0,0 +1,98 @@
+"""TCP reachability probes used before expensive ODBC connects.
+
+An unreachable server otherwise costs the full driver login timeout (DNS, TCP
+retries, TLS). Probing is a plain non-blocking connect: all candidate addresses
+are started at once and awaited with one selector, so N endpoints cost about one
+round trip rather than N.
+"""
+from __future__ import annotations
+
+import errno
+import selectors
+import socket
+import time
+from typing import Optional, Sequence
+
+DEFAULT_MSSQL_PORT = 1433
+
+# Probe budget ahead of an ODBC connect; well under any driver login timeout
+PROBE_TIMEOUT_MS = 1500
+
+# connect_ex codes meaning "handshake started" (WSAEWOULDBLOCK is 10035 on Windows)
+_IN_PROGRESS = frozenset({errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN, 10035})
+
+# Server names that may use shared memory / named pipes instead of TCP
+_LOCAL_ALIASES = frozenset({".", "(local)", "(localdb)"})
+
+
+def sql_server_endpoint(server: str, port: Optional[int] = None) -> Optional[tuple[str, int]]:
+    """Map an ODBC SERVER value to the (host, port) to probe, or None if it can't be probed.
+
+    Handles the "tcp:" prefix and the "host,port" form. Named instances
+    ("host\\instance") resolve their port through SQL Browser, so they are not probed.
+    """
+    server = (server or "").strip()
+    if server[:4].lower() == "tcp:":
+        server = server[4:]
+    if not server or "\\" in server or server.lower() in _LOCAL_ALIASES or server[:3].lower() == "np:":
+        return None
+    host, sep, port_text = server.partition(",")
+    if sep:
+        try:
+            port = int(port_text)
+        except ValueError:
+            return None
+    return host.strip(), port or DEFAULT_MSSQL_PORT
+
+
+def probe_reachable(candidates: Sequence[tuple[str, int]], timeout_ms: int) -> list[bool]:
+    """Return, per (host, port) candidate, whether any of its addresses accepts a TCP connect.
+
+    Name resolution happens up front; the connects then run concurrently and the
+    whole probe is bounded by timeout_ms.
+    """
+    reachable = [False] * len(candidates)
+    sel = selectors.DefaultSelector()
+    pending = 0
+    try:
+        for index, (host, port) in enumerate(candidates):
+            try:
+                infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            except OSError:
+                continue
+            for family, type_, proto, _, addr in infos:
+                sock = socket.socket(family, type_, proto)
+                sock.setblocking(False)
+                err = sock.connect_ex(addr)
+                if err == 0:
+                    reachable[index] = True
+                    sock.close()
+                elif err in _IN_PROGRESS:
+                    sel.register(sock, selectors.EVENT_WRITE, index)
+                    pending += 1
+                else:
+                    sock.close()
+
+        deadline = time.monotonic() + timeout_ms / 1000.0
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for key, _ in sel.select(remaining):
+                sock = key.fileobj
+                if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                    reachable[key.data] = True
+                sel.unregister(sock)
+                sock.close()
+                pending -= 1
+    finally:
+        for key in list(sel.get_map().values()):
+            key.fileobj.close()
+        sel.close()
+    return reachable
+
+
+def ensure_reachable(endpoint: tuple[str, int], timeout_ms: int = PROBE_TIMEOUT_MS) -> None:
+    """Raise TimeoutError if endpoint does not accept a TCP connect within timeout_ms."""
+    if not probe_reachable([endpoint], timeout_ms)[0]:
+        raise TimeoutError(f"Cannot reach server {endpoint[0]}:{endpoint[1]}")
@@ -0,0 +1,115 @@
+"""ODBC driver-manager connection pooling.
+
+pyodbc only honours ``pyodbc.pooling`` until its first connection allocates the
+ODBC environment, so every connect in the app obtains the module through
+:func:`load_pyodbc`, which switches pooling on before it is used. With pooling on,
+the driver manager keeps a closed physical connection alive and hands it back to
+the next connect with an identical connection string, skipping the TCP/TLS/AAD
+handshake. How long an idle pooled connection survives is driver-manager
+configuration, e.g. in odbcinst.ini::
+
+    [ODBC Driver 18 for SQL Server]
+    CPTimeout = 60
+
+Connection tests additionally keep their own successful handles for a while
+(:data:`test_connections`), so re-testing unchanged settings skips the connect.
+"""
+from __future__ import annotations
+
+import threading
+import time
+
+
+def load_pyodbc():
+    """Return the pyodbc module with driver-manager pooling enabled.
+
+    Raises ImportError when pyodbc is not installed (it is optional).
+    """
+    import pyodbc  # type: ignore
+
+    if getattr(pyodbc, "pooling", None) is not True:
+        pyodbc.pooling = True
+    return pyodbc
+
+
+# How long a connection kept from a successful connection test is reused
+TEST_CONN_TTL_SECONDS = 300.0
+
+
+def _close_quietly(conn) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+class ConnectionCache:
+    """Open connections kept for reuse, keyed by the caller, for ttl_seconds after opening.
+
+    A cached connection is only reused if it still answers SELECT 1. Expired entries
+    are closed whenever the cache is consulted and by sweep(); clear() closes all of
+    them. Safe to use from worker threads: connections are closed outside the lock.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: dict = {}  # key -> (connection, expires_at)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def reuse(self, key) -> bool:
+        """True if a live, unexpired connection is cached for key."""
+        self.sweep()
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        conn = entry[0]
+        try:
+            # Standard pool liveness check: far cheaper than a fresh handshake
+            conn.execute("SELECT 1").fetchval()
+        except Exception:
+            _close_quietly(conn)  # Dead handle (server restart, idle drop)
+            return False
+        with self._lock:
+            replaced = key in self._entries
+            if not replaced:
+                self._entries[key] = entry
+        if replaced:
+            _close_quietly(conn)
+        return True
+
+    def remember(self, key, conn) -> None:
+        """Cache conn under key, closing any connection it replaces."""
+        with self._lock:
+            old = self._entries.pop(key, None)
+            self._entries[key] = (conn, time.monotonic() + self.ttl_seconds)
+        if old is not None and old[0] is not conn:
+            _close_quietly(old[0])
+
+    def sweep(self) -> None:
+        """Close connections whose TTL has passed."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (_, expires_at) in self._entries.items() if expires_at <= now]
+            conns = [self._entries.pop(key)[0] for key in expired]
+        for conn in conns:
+            _close_quietly(conn)
+
+    def clear(self) -> None:
+        """Close every cached connection."""
+        with self._lock:
+            conns = [conn for conn, _ in self._entries.values()]
+            self._entries.clear()
+        for conn in conns:
+            _close_quietly(conn)
+
+
+# Handles from successful connection tests (dialog and controller), shared so a
+# repeated test with the same settings costs a SELECT 1, not a TCP/TLS/AAD handshake
+test_connections = ConnectionCache(TEST_CONN_TTL_SECONDS)
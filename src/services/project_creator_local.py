@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Optional
 import sqlite3
 
 
@@ -10,7 +11,12 @@ class ProjectCreatorLocal:
     def __init__(self, target_path: Path | str) -> None:
         self.target_path = Path(target_path)
 
-    def create(self) -> None:
+    def create(self, keep_open: bool = False) -> Optional[sqlite3.Connection]:
+        """Create the DB and apply the schema.
+
+        With keep_open=True the live connection is returned (caller closes it)
+        so follow-up writes do not pay for a second open of the same file.
+        """
         # Guard: do not overwrite existing DB file
         if self.target_path.exists():
             raise FileExistsError(f"Target already exists: {self.target_path}")
@@ -27,7 +33,22 @@ class ProjectCreatorLocal:
         self.target_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Create DB and apply schema
-        with sqlite3.connect(str(self.target_path)) as conn:
+        conn = sqlite3.connect(str(self.target_path))
+        try:
+            # WAL is persisted in the file, so every later settings write benefits;
+            # the remaining pragmas apply to this connection (and callers using keep_open)
+            conn.execute("PRAGMA journal_mode=WAL").fetchone()
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-64000")
+            conn.execute("PRAGMA busy_timeout=5000")
             conn.executescript(sql)
             conn.commit()
+        except BaseException:
+            conn.close()
+            raise
+        if keep_open:
+            return conn
+        conn.close()
+        return None
 
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Dict, Any
 
 from src.services.mssql_connection import build_connect_kwargs
+from src.services.odbc_pool import load_pyodbc
 
 
 class ProjectCreatorRemote:
@@ -27,7 +28,7 @@ class ProjectCreatorRemote:
     def _test_connection(self) -> None:
         """Test the actual database connection to ensure credentials work."""
         try:
-            import pyodbc  # type: ignore
+            pyodbc = load_pyodbc()
         except ImportError:
             # If pyodbc is not available, skip the connection test
             # This maintains backward compatibility
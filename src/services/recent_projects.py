@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import json
 import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, lru_cache
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone
 from pathlib import Path
@@ -9,19 +12,76 @@ from typing import List, Dict, Any
 
 from src.lib import paths as paths_mod
 
+try:  # Optional fast JSON codec; the stdlib json module is the fallback
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
 MAX_RECENT = 10
+_UTC = timezone.utc
 
 
 def _now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
+    return datetime.now(_UTC).isoformat()
 
 
+@lru_cache(maxsize=256)
 def _normcase(p: str) -> str:
-    # Windows-insensitive comparison; safe on other OSes too
+    # Windows-insensitive comparison; safe on other OSes too.
+    # Callers pass absolute paths, so memoizing is independent of the CWD.
     return os.path.normcase(os.path.abspath(p))
 
 
-@dataclass
+def _existing_paths(paths: List[str]) -> set[str]:
+    """Return the subset of `paths` that exist, batching filesystem lookups.
+
+    Entries sharing a directory are checked against a single os.scandir listing
+    instead of one stat each; the remaining paths are stat'ed concurrently so
+    that waits on high-latency (network) mounts overlap.
+    """
+    by_dir: Dict[str, List[str]] = {}
+    for p in paths:
+        by_dir.setdefault(os.path.dirname(os.path.abspath(p)), []).append(p)
+
+    found: set[str] = set()
+    to_stat: List[str] = []
+    for d, members in by_dir.items():
+        if len(members) < 2:
+            to_stat.extend(members)
+            continue
+        try:
+            with os.scandir(d) as it:
+                names = {os.path.normcase(e.name) for e in it}
+        except FileNotFoundError:
+            continue
+        except OSError:
+            to_stat.extend(members)
+            continue
+        found.update(p for p in members if os.path.normcase(os.path.basename(p)) in names)
+
+    if len(to_stat) == 1:
+        if os.path.exists(to_stat[0]):
+            found.add(to_stat[0])
+    elif to_stat:
+        with ThreadPoolExecutor(max_workers=min(MAX_RECENT, len(to_stat))) as pool:
+            found.update(p for p, ok in zip(to_stat, pool.map(os.path.exists, to_stat)) if ok)
+    return found
+
+
+@cache
+def _recent_path() -> Path:
+    # The recent-list location is process-global; resolve it (env lookup + mkdir) once
+    return paths_mod.recent_projects_path()
+
+
+@dataclass(slots=True)
 class RecentEntry:
     path: str
     last_opened: str
@@ -38,41 +98,55 @@ class RecentProjectsService:
     """
 
     def __init__(self) -> None:
-        self._path: Path = paths_mod.recent_projects_path()
-        self._data: List[RecentEntry] = []
+        self._path: Path = _recent_path()
+        # Most recent first, keyed by normalized path for O(1) de-dup
+        self._data: OrderedDict[str, RecentEntry] = OrderedDict()
         self._loaded: bool = False
+        self._dir_ensured: bool = False
+        # Last bytes known to be on disk; lets _save skip identical rewrites
+        self._last_written_bytes: bytes | None = None
+        # Serialized view of _data, rebuilt only after a mutation
+        self._cached_list: List[Dict[str, Any]] | None = None
 
     # Public API -----------------------------------------------------
     def clear(self) -> None:
-        self._data = []
+        self._ensure_loaded()
+        if not self._data:
+            return
+        self._data.clear()
+        self._cached_list = None
         self._save()
 
-    def add(self, project_path: str) -> None:
+    def add(self, project_path: str) -> Dict[str, Any]:
+        """Add or move a project to the top; returns the new entry."""
         self._ensure_loaded()
         abs_path = os.path.abspath(project_path)
         key = _normcase(abs_path)
 
-        # Remove any existing entry matching this path (case-insensitive)
-        self._data = [e for e in self._data if _normcase(e.path) != key]
-
-        # Insert at top
-        self._data.insert(0, RecentEntry(path=abs_path, last_opened=_now_iso()))
+        # Replace any existing entry matching this path (case-insensitive) and move it to the top
+        entry = RecentEntry(path=abs_path, last_opened=_now_iso())
+        self._data.pop(key, None)
+        self._data[key] = entry
+        self._data.move_to_end(key, last=False)
 
         # Cap to MAX_RECENT
-        self._data = self._data[:MAX_RECENT]
+        while len(self._data) > MAX_RECENT:
+            self._data.popitem(last=True)
+        self._cached_list = None
         self._save()
+        return asdict(entry)
 
     def list(self) -> List[Dict[str, Any]]:
         self._ensure_loaded()
-        return [asdict(e) for e in self._data]
+        # Shallow copies so callers cannot mutate the cached snapshot
+        return [dict(e) for e in self._snapshot()]
 
     def remove(self, project_path: str) -> None:
         """Remove an entry by path (case-insensitive)."""
         self._ensure_loaded()
         key = _normcase(os.path.abspath(project_path))
-        before = len(self._data)
-        self._data = [e for e in self._data if _normcase(e.path) != key]
-        if len(self._data) != before:
+        if self._data.pop(key, None) is not None:
+            self._cached_list = None
             self._save()
 
     def reload(self) -> None:
@@ -85,43 +159,65 @@ class RecentProjectsService:
         if self._loaded:
             return
         raw = self._read_file()
-        entries: List[RecentEntry] = []
+        existing = _existing_paths([item["path"] for item in raw if item.get("path")])
+        data: OrderedDict[str, RecentEntry] = OrderedDict()
         for item in raw:
             p = item.get("path")
-            ts = item.get("last_opened") or _now_iso()
             if not p:
                 continue
             # Drop entries whose file no longer exists
-            if not Path(p).exists():
+            if p not in existing:
                 continue
-            entries.append(RecentEntry(path=os.path.abspath(p), last_opened=ts))
-        # Deduplicate while preserving order (case-insensitive)
-        seen: set[str] = set()
-        deduped: List[RecentEntry] = []
-        for e in entries:
-            k = _normcase(e.path)
-            if k in seen:
+            abs_path = os.path.abspath(p)
+            # Deduplicate while preserving order (case-insensitive)
+            k = _normcase(abs_path)
+            if k in data:
                 continue
-            seen.add(k)
-            deduped.append(e)
-        self._data = deduped[:MAX_RECENT]
+            data[k] = RecentEntry(path=abs_path, last_opened=item.get("last_opened") or _now_iso())
+            if len(data) == MAX_RECENT:
+                break
+        self._data = data
+        self._cached_list = None
         self._loaded = True
-        # Persist normalized/deduped form
-        self._save()
+        # Persist normalized/deduped form (only if it differs from what is on disk)
+        if self._last_written_bytes is None or raw != self._snapshot():
+            self._save()
 
-    def _read_file(self) -> List[Dict[str, Any]]:
+    def _snapshot(self) -> List[Dict[str, Any]]:
+        if self._cached_list is None:
+            self._cached_list = [asdict(e) for e in self._data.values()]
+        return self._cached_list
+
+    def _ensure_dir(self) -> None:
+        if self._dir_ensured:
+            return
         self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._dir_ensured = True
+
+    def _read_file(self) -> List[Dict[str, Any]]:
+        self._ensure_dir()
         if not self._path.exists():
-            self._path.write_text("[]", encoding="utf-8")
+            self._path.write_bytes(b"[]")
+            self._last_written_bytes = b"[]"
             return []
         try:
-            return json.loads(self._path.read_text(encoding="utf-8") or "[]")
-        except Exception:
-            # On parse error, reset to empty
+            content = self._path.read_bytes()
+            self._last_written_bytes = content
+            # Both codecs accept bytes directly; no intermediate str copy
+            return _loads(content or b"[]")
+        except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+            # On read/parse error, reset to empty (and force the rewrite)
+            self._last_written_bytes = None
             return []
 
     def _save(self) -> None:
-        self._path.parent.mkdir(parents=True, exist_ok=True)
-        data = [asdict(e) for e in self._data]
-        self._path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        payload = _dumps(self._snapshot())
+        if payload == self._last_written_bytes:
+            return
+        self._ensure_dir()
+        # Write to a temp file and swap it in so a crash never leaves a torn file
+        tmp_path = self._path.with_suffix(".json.tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, self._path)
+        self._last_written_bytes = payload
 
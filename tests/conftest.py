@@ -0,0 +1,54 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _fresh_recent_path():
+    # RecentProjectsService resolves its file once per process; tests route it to
+    # tmp_path through paths_mod.recent_projects_path, so resolve it again per test
+    from src.services.recent_projects import _recent_path
+
+    _recent_path.cache_clear()
+    yield
+    _recent_path.cache_clear()
+
+
+class FakeConnection:
+    """pyodbc connection stand-in that answers the SELECT 1 liveness check until marked dead."""
+
+    def __init__(self) -> None:
+        self.dead = False
+        self.closed = False
+
+    def execute(self, sql):
+        assert sql == "SELECT 1"
+        if self.dead:
+            raise RuntimeError("Communication link failure")
+        return self
+
+    def fetchval(self):
+        return 1
+
+    def close(self):
+        self.closed = True
+
+
+class FakePyodbc:
+    """pyodbc module stand-in recording each connect(); set fail to raise for some strings."""
+
+    def __init__(self) -> None:
+        self.connects: list[str] = []
+        self.connections: list[FakeConnection] = []
+        self.fail = None
+
+    def connect(self, conn_str, **kwargs):
+        self.connects.append(conn_str)
+        if self.fail is not None:
+            self.fail(conn_str)
+        conn = FakeConnection()
+        self.connections.append(conn)
+        return conn
+
+
+@pytest.fixture
+def fake_pyodbc():
+    return FakePyodbc()
@@ -9,3 +9,21 @@ def test_create_project_local_flow(qtbot, tmp_path):
     # Placeholder: after implementation, assert new sqlite project is created and appears in recent list
     assert True
 
+
+
+def test_create_project_local_sets_wal(tmp_path):
+    import sqlite3
+    from src.services.project_creator_local import ProjectCreatorLocal
+
+    target = tmp_path / "new.sqlite"
+    conn = ProjectCreatorLocal(target).create(keep_open=True)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    finally:
+        conn.close()
+
+    # journal_mode is persisted in the file itself
+    with sqlite3.connect(str(target)) as reopened:
+        assert reopened.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    reopened.close()
@@ -3,9 +3,441 @@ import pytest
 pytest.importorskip("PySide6")
 pytest.importorskip("pytestqt")
 
+from src.services.odbc_pool import ConnectionCache  # noqa: E402
+
 
 def test_create_project_remote_requires_successful_test_connection(qtbot):
     from src.app.controllers.startup_controller import StartupController  # noqa: F401
     # Placeholder: after implementation, assert creation blocked until Test Connection success
     assert True
 
+
+
+def test_connection_test_string_is_memoized():
+    from src.app.controllers import startup_controller as sc
+
+    ctrl = sc.StartupController.__new__(sc.StartupController)
+    desc = {"server": "srv", "database": "db", "auth_type": "azure_ad_interactive",
+            "username": "bob", "authority": "https://login", "password": "secret"}
+
+    sc._build_test_conn_str.cache_clear()
+    conn_str, timeout = ctrl._build_connection_string_for_test(desc)
+    assert timeout == 30
+    assert conn_str == (
+        "DRIVER={ODBC Driver 18 for SQL Server};SERVER=srv;DATABASE=db;"
+        "Authentication=ActiveDirectoryInteractive;UID=bob;Authority=https://login;"
+        "Encrypt=yes;TrustServerCertificate=yes"
+    )
+    assert ctrl._build_connection_string_for_test(dict(desc))[0] is conn_str
+    assert ctrl._build_connection_string_for_test_driver17(desc)[0] == conn_str.replace("Driver 18", "Driver 17")
+
+    with pytest.raises(ValueError):
+        ctrl._build_connection_string_for_test({"server": "srv", "auth_type": "sql"})
+    assert "secret" not in repr(sc._test_conn_key(desc))
+
+
+def test_connection_test_remembers_driver17_fallback(monkeypatch, fake_pyodbc):
+    from src.app.controllers import startup_controller as sc
+
+    def fail_on_driver18(conn_str):
+        if "Driver 18" in conn_str:
+            raise RuntimeError("[FA004] Failed to authenticate (0x534)")
+
+    class FakeTokenManager:
+        def get_connection_string(self, descriptor):
+            return "DRIVER={ODBC Driver 18 for SQL Server};SERVER=aad-srv"
+
+    fake_pyodbc.fail = fail_on_driver18
+    monkeypatch.setattr(sc, "_pyodbc", fake_pyodbc)
+    monkeypatch.setattr(sc, "test_connections", ConnectionCache(60.0))
+    monkeypatch.setattr(sc, "get_token_manager", lambda: FakeTokenManager())
+    monkeypatch.setattr(sc.StartupController, "_driver17_required", set())
+
+    def attempts():
+        return ["17" if "Driver 17" in c else "18" for c in fake_pyodbc.connects]
+
+    ctrl = sc.StartupController()
+    desc = {"server": "aad-srv", "database": "db", "auth_type": "azure_ad_interactive"}
+    assert ctrl._perform_connection_test(desc) is True
+    assert attempts() == ["18", "17"]
+    sc.test_connections.clear()
+    assert ctrl._perform_connection_test(desc) is True
+    assert attempts() == ["18", "17", "17"]
+
+
+def test_probe_connection_reuses_recent_handle(monkeypatch, fake_pyodbc):
+    from src.app.controllers import startup_controller as sc
+
+    connects = fake_pyodbc.connects
+    clock = [1000.0]
+    monkeypatch.setattr("src.services.odbc_pool.time.monotonic", lambda: clock[0])
+    cache = ConnectionCache(60.0)
+    monkeypatch.setattr(sc, "_pyodbc", fake_pyodbc)
+    monkeypatch.setattr(sc, "test_connections", cache)
+    ctrl = sc.StartupController()
+    ctrl._probe_connection("DRIVER=x;SERVER=a", 5)
+    ctrl._probe_connection("DRIVER=x;SERVER=a", 5)
+    assert connects == ["DRIVER=x;SERVER=a"]
+
+    # Expired handles are closed and replaced
+    conn = fake_pyodbc.connections[-1]
+    clock[0] += 61
+    ctrl._probe_connection("DRIVER=x;SERVER=a", 5)
+    assert conn.closed and len(connects) == 2
+
+    # Handles failing the liveness check are closed and replaced too
+    conn = fake_pyodbc.connections[-1]
+    conn.dead = True
+    ctrl._probe_connection("DRIVER=x;SERVER=a", 5)
+    assert conn.closed and len(connects) == 3
+
+    # Probing other settings closes handles that have expired meanwhile
+    conn = fake_pyodbc.connections[-1]
+    clock[0] += 61
+    ctrl._probe_connection("DRIVER=x;SERVER=b", 5)
+    assert conn.closed and "DRIVER=x;SERVER=a" not in cache and len(cache) == 1
+
+    # Every remaining handle is closed once the project flow is over
+    conn = fake_pyodbc.connections[-1]
+    ctrl._on_close_ok(None)
+    assert conn.closed and len(cache) == 0
+
+
+def test_connection_test_failure_reports_asynchronously(qtbot, monkeypatch):
+    from src.app.controllers import startup_controller as sc
+
+    class FailingPyodbc:
+        @staticmethod
+        def connect(conn_str, **kwargs):
+            raise RuntimeError("x" * 5000)
+
+    shown = []
+    monkeypatch.setattr(sc, "_pyodbc", FailingPyodbc)
+    monkeypatch.setattr(sc, "ensure_reachable", lambda endpoint: None)
+    monkeypatch.setattr(sc.QMessageBox, "critical", lambda parent, title, text: shown.append(text))
+
+    ctrl = sc.StartupController()
+    desc = {"server": "srv", "database": "db", "auth_type": "sql", "username": "u"}
+    assert ctrl._perform_connection_test(desc) is False
+    assert shown == []  # not shown synchronously
+
+    qtbot.waitUntil(lambda: len(shown) == 1, timeout=2000)
+    assert "x" * sc._MAX_ERROR_DISPLAY_CHARS + "..." in shown[0]
+    assert "x" * (sc._MAX_ERROR_DISPLAY_CHARS + 1) not in shown[0]
+
+
+def test_connection_test_fails_fast_when_server_unreachable(qtbot, monkeypatch):
+    import socket
+    from src.app.controllers import startup_controller as sc
+
+    class UnusedPyodbc:
+        @staticmethod
+        def connect(conn_str, **kwargs):
+            raise AssertionError("connect must not run for an unreachable server")
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        closed_port = s.getsockname()[1]
+
+    shown = []
+    monkeypatch.setattr(sc, "_pyodbc", UnusedPyodbc)
+    monkeypatch.setattr(sc.QMessageBox, "critical", lambda parent, title, text: shown.append(text))
+    monkeypatch.setattr(sc, "test_connections", ConnectionCache(60.0))
+    ctrl = sc.StartupController()
+    desc = {"server": f"127.0.0.1,{closed_port}", "database": "db", "auth_type": "sql", "username": "u"}
+    assert ctrl._perform_connection_test(desc) is False
+    assert len(sc.test_connections) == 0
+    qtbot.waitUntil(lambda: len(shown) == 1, timeout=2000)
+    assert "Cannot reach server" in shown[0]
+
+
+def test_dialog_descriptor_reuses_parse_until_fields_change(qtbot):
+    from src.app.dialogs.mssql_connection_dialog import MSSQLConnectionDialog
+
+    dlg = MSSQLConnectionDialog()
+    qtbot.addWidget(dlg)
+    dlg.server.setText(" srv ")
+    dlg.database.setText("db")
+    dlg.port.setText("1433")
+    dlg.username.setText(" bob ")
+
+    first = dlg.descriptor()
+    assert first == {"server": "srv", "database": "db", "auth_type": "sql", "port": 1433, "username": "bob"}
+    cached = dlg._descriptor_cache
+    first["password"] = "secret"  # callers may extend the result
+    assert dlg.descriptor() == {"server": "srv", "database": "db", "auth_type": "sql", "port": 1433, "username": "bob"}
+    assert dlg._descriptor_cache is cached
+
+    dlg.port.setText("")
+    assert "port" not in dlg.descriptor()
+
+
+def test_sql_password_store_skips_unchanged_password(qtbot, monkeypatch):
+    from src.app.controllers import startup_controller as sc
+    from src.services.azure_ad_token_manager import ConnectionDescriptor
+
+    stored = []
+
+    class FakeCredentialManager:
+        def __init__(self):
+            self.held = set()
+
+        def has_password(self, key):
+            return key in self.held
+
+        def store_password(self, key, password):
+            stored.append((key, password))
+            self.held.add(key)
+
+    mgr = FakeCredentialManager()
+    monkeypatch.setattr(sc, "get_credential_manager", lambda: mgr)
+    monkeypatch.setattr(sc.MSSQLConnectionDialog, "exec", lambda self: sc.QDialog.Accepted)
+
+    ctrl = sc.StartupController()
+    ctrl._current_project_path = "/tmp/p.sqlite"
+    desc = ConnectionDescriptor(server="srv", database="db", auth_type="sql", username="u")
+    password = ["pw1"]
+    orig_init = sc.MSSQLConnectionDialog.__init__
+
+    def init(self, parent=None):
+        orig_init(self, parent)
+        qtbot.addWidget(self)
+        self.password.setText(password[0])
+
+    monkeypatch.setattr(sc.MSSQLConnectionDialog, "__init__", init)
+
+    assert ctrl._authenticate_sql_project(desc) is True
+    assert ctrl._authenticate_sql_project(desc) is True
+    assert stored == [("/tmp/p.sqlite", "pw1")]
+
+    mgr.held.clear()  # e.g. cleared when the project was closed
+    assert ctrl._authenticate_sql_project(desc) is True
+    password[0] = "pw2"
+    assert ctrl._authenticate_sql_project(desc) is True
+    assert [p for _, p in stored] == ["pw1", "pw1", "pw2"]
+
+
+def test_dialog_test_connections_are_reused_within_ttl(qtbot, monkeypatch, fake_pyodbc):
+    from src.app.dialogs import mssql_connection_dialog as mcd
+
+    connects = fake_pyodbc.connects
+    clock = [1000.0]
+    monkeypatch.setattr("src.services.odbc_pool.time.monotonic", lambda: clock[0])
+    cache = ConnectionCache(60.0)
+    monkeypatch.setattr(mcd, "test_connections", cache)
+    desc = {"server": "srv", "database": "db", "auth_type": "sql", "username": "u"}
+    key = mcd._test_conn_cache_key(desc, "18", "pw")
+    mcd._connect_for_test(fake_pyodbc, "DSN", 5, key)
+    mcd._connect_for_test(fake_pyodbc, "DSN", 5, key)
+    assert len(connects) == 1
+
+    # A different password never reuses the cached handle
+    clock[0] += 30
+    mcd._connect_for_test(fake_pyodbc, "DSN", 5, mcd._test_conn_cache_key(desc, "18", "other"))
+    assert len(connects) == 2
+
+    # Expired entries are closed by the sweep
+    first, second = fake_pyodbc.connections
+    clock[0] += 31
+    cache.sweep()
+    assert first.closed and key not in cache
+    assert not second.closed and len(cache) == 1
+
+    # Closing a dialog closes the rest
+    dlg = mcd.MSSQLConnectionDialog()
+    qtbot.addWidget(dlg)
+    dlg.reject()
+    assert second.closed and len(cache) == 0
+
+
+def test_dialog_connection_string_builder_is_memoized_without_password():
+    from src.app.dialogs import mssql_connection_dialog as mcd
+
+    mcd._odbc_conn_parts.cache_clear()
+    desc = {"server": "srv", "database": "db", "port": 1444, "auth_type": "sql", "username": "bob"}
+    assert mcd._odbc_conn_str(desc, "pw") == (
+        "DRIVER={ODBC Driver 18 for SQL Server};SERVER=srv,1444;DATABASE=db;UID=bob;PWD=pw;"
+        "Encrypt=yes;TrustServerCertificate=no"
+    )
+    assert "PWD" not in mcd._odbc_conn_str(desc, "")
+    assert mcd._odbc_conn_parts.cache_info().hits == 1
+    assert mcd._odbc_conn_str({"server": "srv", "database": "db"}, "pw", "17") == (
+        "DRIVER={ODBC Driver 17 for SQL Server};SERVER=srv;DATABASE=db;Trusted_Connection=yes;"
+        "Encrypt=yes;TrustServerCertificate=no"
+    )
+
+
+def test_dialog_auth_type_toggles_credential_fields(qtbot, monkeypatch):
+    from src.app.dialogs.mssql_connection_dialog import MSSQLConnectionDialog
+
+    dlg = MSSQLConnectionDialog()
+    qtbot.addWidget(dlg)
+    dlg.username.setText("bob")
+    dlg.password.setText("pw")
+
+    dlg.auth_type.setCurrentText("Azure AD Interactive")
+    assert dlg.username.isEnabled() and not dlg.password.isEnabled()
+    assert dlg.username.text() == "bob" and dlg.password.text() == ""
+
+    dlg.auth_type.setCurrentText("Azure AD Integrated")
+    assert not dlg.username.isEnabled() and dlg.username.text() == ""
+
+    dlg.auth_type.setCurrentText("MS-SQL")
+    assert dlg.username.isEnabled() and dlg.password.isEnabled()
+
+    calls = []
+    for name in ("setEnabled", "clear"):
+        monkeypatch.setattr(dlg.username, name, lambda *a, name=name: calls.append(name))
+    dlg._on_auth_type_changed("MS-SQL")  # already in that state
+    assert calls == []
+
+
+def test_dialog_edits_after_successful_test_disable_ok(qtbot, monkeypatch):
+    from src.app.dialogs.mssql_connection_dialog import MSSQLConnectionDialog
+
+    dlg = MSSQLConnectionDialog()
+    qtbot.addWidget(dlg)
+    dlg._test_ok = True
+    dlg.btn_ok.setEnabled(True)
+
+    dlg.server.setText("s")
+    assert not dlg._test_ok and not dlg.btn_ok.isEnabled()
+
+    calls = []
+    monkeypatch.setattr(dlg.btn_ok, "setEnabled", lambda v: calls.append(v))
+    dlg.server.setText("srv")  # already invalid: no further widget updates
+    assert calls == []
+
+
+def test_dialog_edit_cancels_inflight_connection_test(qtbot, monkeypatch):
+    import threading
+    from PySide6.QtCore import Qt
+    from src.app.dialogs.mssql_connection_dialog import MSSQLConnectionDialog
+
+    dlg = MSSQLConnectionDialog()
+    qtbot.addWidget(dlg)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_test(desc, kwargs, conn_str, pwd):
+        assert threading.current_thread().name.startswith("cpd-bg")  # connection-test pool
+        started.set()
+        release.wait(2)
+        return "ok"
+
+    monkeypatch.setattr(dlg, "_perform_connection_test", slow_test)
+    shown = []
+    monkeypatch.setattr("src.app.dialogs.mssql_connection_dialog.QMessageBox.information",
+                        lambda *a: shown.append(a))
+
+    dlg._run_connection_test_async({"server": "srv"}, {}, "DRIVER=x", "")
+    fut = dlg._test_future
+    assert started.wait(2)
+    assert not dlg.btn_test.isEnabled() and dlg.cursor().shape() == Qt.BusyCursor
+
+    dlg.server.setText("other")  # edit while the test is running
+    assert dlg.btn_test.isEnabled() and dlg._test_future is None
+    assert dlg.cursor().shape() == Qt.ArrowCursor
+
+    release.set()
+    fut.result(timeout=2)
+    qtbot.wait(50)
+    assert shown == [] and not dlg._test_ok
+
+
+def test_dialog_probes_for_pyodbc_once(qtbot, monkeypatch):
+    from src.app.dialogs import mssql_connection_dialog as mcd
+
+    calls = []
+
+    def missing():
+        calls.append(1)
+        raise ImportError("No module named 'pyodbc'")
+
+    monkeypatch.setattr(mcd, "load_pyodbc", missing)
+    monkeypatch.setattr(mcd, "_pyodbc", mcd._PYODBC_UNPROBED)
+    dlg = mcd.MSSQLConnectionDialog()
+    qtbot.addWidget(dlg)
+
+    desc = {"server": "srv", "database": "db", "auth_type": "sql"}
+    for _ in range(2):
+        msg = dlg._perform_connection_test(desc, {}, "DRIVER=x", "pw")
+        assert msg.startswith("Connection settings look OK")
+    assert calls == [1]
+
+
+def test_dialog_retest_of_verified_settings_skips_connect(qtbot, monkeypatch):
+    from src.app.dialogs import mssql_connection_dialog as mcd
+
+    dlg = mcd.MSSQLConnectionDialog()
+    qtbot.addWidget(dlg)
+    tests = []
+    monkeypatch.setattr(dlg, "_perform_connection_test", lambda *a: tests.append(a) or "Connection succeeded.")
+    shown = []
+    monkeypatch.setattr(mcd.QMessageBox, "information", lambda parent, title, text: shown.append(text))
+
+    dlg.server.setText("srv")
+    dlg.database.setText("db")
+    dlg.username.setText("u")
+    dlg.password.setText("pw")
+    dlg.on_test()
+    qtbot.waitUntil(lambda: dlg._test_ok, timeout=2000)
+
+    dlg.database.setText("db2")
+    dlg.database.setText("db")  # back to the verified settings
+    assert not dlg._test_ok
+    dlg.on_test()
+    assert dlg._test_ok and dlg.btn_ok.isEnabled()
+    assert len(tests) == 1 and shown[-1].startswith("Previously verified")
+
+
+def test_dialog_reopened_after_close_tests_again(qtbot, monkeypatch):
+    from src.app.dialogs import mssql_connection_dialog as mcd
+
+    dlg = mcd.MSSQLConnectionDialog()
+    qtbot.addWidget(dlg)
+    tests = []
+    monkeypatch.setattr(dlg, "_perform_connection_test", lambda *a: tests.append(a) or "Connection succeeded.")
+    shown = []
+    monkeypatch.setattr(mcd.QMessageBox, "information", lambda parent, title, text: shown.append(text))
+
+    dlg.server.setText("srv")
+    dlg.database.setText("db")
+    dlg.username.setText("u")
+    dlg.password.setText("pw")
+    dlg.on_test()
+    qtbot.waitUntil(lambda: dlg._test_ok, timeout=2000)
+    dlg.accept()
+
+    # Same settings in the reopened dialog still go through the worker
+    dlg.open()
+    dlg.on_test()
+    qtbot.waitUntil(lambda: len(tests) == 2, timeout=2000)
+    assert not any(text.startswith("Previously verified") for text in shown)
+
+    dlg.password.setText("other")  # a different password is never vouched for
+    dlg.on_test()
+    qtbot.waitUntil(lambda: len(tests) == 2, timeout=2000)
+
+
+def test_controller_reused_connection_dialog_needs_a_fresh_test(qtbot, monkeypatch):
+    from src.app.controllers import startup_controller as sc
+
+    ctrl = sc.StartupController()
+    dlg = ctrl._get_connection_dialog()
+    qtbot.addWidget(dlg)
+    monkeypatch.setattr(dlg, "_perform_connection_test", lambda *a: "Connection succeeded.")
+    monkeypatch.setattr(sc.QMessageBox, "information", lambda parent, title, text: None)
+
+    dlg.server.setText("srv")
+    dlg.database.setText("db")
+    dlg.username.setText("u")
+    dlg.password.setText("pw")
+    dlg.on_test()
+    qtbot.waitUntil(lambda: dlg._test_ok, timeout=2000)
+    dlg._use_driver17 = True
+
+    assert ctrl._get_connection_dialog() is dlg
+    assert dlg.server.text() == "srv" and dlg.database.text() == "db"
+    assert dlg.password.text() == ""
+    assert not dlg._test_ok and not dlg._use_driver17 and dlg._last_ok is None
+    assert not dlg.btn_ok.isEnabled()
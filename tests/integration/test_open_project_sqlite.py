@@ -11,3 +11,190 @@ def test_open_existing_project_runs_schema_checks(qtbot, tmp_path):
     # - expect schema check → migration or refusal
     assert True
 
+
+
+def test_read_project_settings_single_probe(tmp_path):
+    import sqlite3
+    from src.app.controllers.startup_controller import StartupController
+
+    db = tmp_path / "proj.sqlite"
+    with sqlite3.connect(str(db)) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE settings(key TEXT PRIMARY KEY, value TEXT)")
+        conn.executemany(
+            "INSERT INTO settings(key, value) VALUES(?, ?)",
+            [("storage_mode", "mssql"), ("remote_server", "srv"), ("other", "x")],
+        )
+    conn.close()
+
+    ctrl = StartupController()
+    got = ctrl._read_project_settings(db, ("storage_mode", "remote_server", "remote_port"), None)
+    assert got == {"storage_mode": "mssql", "remote_server": "srv"}
+
+
+def test_read_project_settings_without_settings_table(tmp_path):
+    import sqlite3
+    from src.app.controllers.startup_controller import StartupController
+
+    db = tmp_path / "empty.sqlite"
+    sqlite3.connect(str(db)).close()
+
+    assert StartupController()._read_project_settings(db) == {}
+
+
+def test_settings_sql_placeholders_match_keys():
+    from src.app.controllers import startup_controller as sc
+
+    assert sc._OPEN_SETTINGS_SQL.count("?") == len(sc._OPEN_SETTINGS_KEYS)
+
+
+def test_read_remote_descriptor_bg(tmp_path):
+    import sqlite3
+    from src.app.controllers.startup_controller import StartupController
+
+    db = tmp_path / "remote.sqlite"
+    with sqlite3.connect(str(db)) as conn:
+        conn.execute("CREATE TABLE settings(key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute("INSERT INTO settings VALUES('storage_mode', 'sqlite')")
+    conn.close()
+
+    ctrl = StartupController()
+    assert ctrl._read_remote_descriptor_bg(db) is None
+
+    with sqlite3.connect(str(db)) as conn:
+        conn.execute("UPDATE settings SET value='mssql' WHERE key='storage_mode'")
+    conn.close()
+    with pytest.raises(ValueError):
+        ctrl._read_remote_descriptor_bg(db)
+
+    with sqlite3.connect(str(db)) as conn:
+        conn.executemany(
+            "INSERT INTO settings VALUES(?, ?)",
+            [("remote_server", "srv"), ("remote_database", "db"),
+             ("remote_auth_type", "sql"), ("remote_port", "1444")],
+        )
+    conn.close()
+    desc = ctrl._read_remote_descriptor_bg(db)
+    assert desc.server == "srv,1444"
+    assert desc.database == "db"
+
+
+def test_view_capabilities_resolved_on_assignment():
+    from src.app.controllers import startup_controller as sc
+
+    class BusyOnlyView:
+        def start_busy(self):
+            pass
+
+        def stop_busy(self):
+            pass
+
+    ctrl = sc.StartupController()
+    assert ctrl._view_caps == 0
+    ctrl.view = BusyOnlyView()
+    assert ctrl._view_caps == sc._HAS_START_BUSY | sc._HAS_STOP_BUSY
+    ctrl.view = None
+    assert ctrl._view_caps == 0
+
+
+def test_is_truthy_setting_values():
+    from src.app.controllers.startup_controller import _is_truthy
+
+    assert _is_truthy("1") and _is_truthy(" Yes ") and _is_truthy(1)
+    assert not _is_truthy("0") and not _is_truthy(None) and not _is_truthy("off")
+
+
+def test_open_project_noop_when_already_open(tmp_path, monkeypatch):
+    from src.app.controllers import startup_controller as sc
+    from src.lib import paths as paths_mod
+    from src.services.app_context import ProjectRuntime, app_context
+
+    monkeypatch.setattr(paths_mod, "recent_projects_path", lambda: tmp_path / "recent.json")
+    db = tmp_path / "open.sqlite"
+    db.write_text("x")
+    monkeypatch.setattr(app_context, "_project", ProjectRuntime(sqlite_path=db, storage_mode="sqlite"))
+
+    def fail_run_bg(*args, **kwargs):
+        raise AssertionError("nothing should be scheduled")
+
+    monkeypatch.setattr(sc, "run_bg", fail_run_bg)
+    ctrl = sc.StartupController()
+    assert ctrl.open_project(str(db)) is True
+    assert [e["path"] for e in ctrl.recent_service.list()] == [str(db)]
+
+
+def test_close_project_confirmation_closes_in_background(qtbot, tmp_path, monkeypatch):
+    from PySide6.QtWidgets import QMessageBox
+    from src.app.controllers import startup_controller as sc
+    from src.lib import paths as paths_mod
+    from src.services.app_context import app_context
+    from src.services.project_creator_local import ProjectCreatorLocal
+
+    monkeypatch.setattr(paths_mod, "recent_projects_path", lambda: tmp_path / "recent.json")
+    db = tmp_path / "close.sqlite"
+    ProjectCreatorLocal(db).create()
+    app_context.load_project(db)
+    monkeypatch.setattr(sc.QMessageBox, "information", lambda *a, **k: None)
+
+    ctrl = sc.StartupController()
+    ctrl.on_close_project_clicked()
+    box = ctrl._close_box
+    assert box is not None and app_context.project is not None
+
+    box.button(QMessageBox.Yes).click()
+    qtbot.waitUntil(lambda: app_context.project is None, timeout=3000)
+    assert ctrl._close_box is None
+
+
+def test_apply_db_logging_setting_skips_unchanged_observer(monkeypatch):
+    from src.app.controllers import startup_controller as sc
+
+    class FakeGateway:
+        def __init__(self):
+            self.observers = []
+
+        def set_observer(self, obs):
+            self.observers.append(obs)
+
+    gw = FakeGateway()
+    setting = {"value": "1"}
+    monkeypatch.setattr(type(sc.app_context), "gateway", property(lambda self: gw))
+    monkeypatch.setattr(sc.app_context, "get_setting", lambda key, default=None: setting["value"])
+
+    ctrl = sc.StartupController()
+    ctrl._apply_db_logging_setting()
+    ctrl._apply_db_logging_setting()
+    assert gw.observers == [ctrl._db_observer]
+
+    setting["value"] = "0"
+    ctrl._apply_db_logging_setting()
+    assert gw.observers == [ctrl._db_observer, None]
+
+
+def test_created_project_recorded_when_schema_dialog_cancelled(qtbot, tmp_path, monkeypatch):
+    from src.app.controllers import startup_controller as sc
+    from src.lib import paths as paths_mod
+    from src.services.app_context import app_context
+
+    monkeypatch.setattr(paths_mod, "recent_projects_path", lambda: tmp_path / "recent.json")
+    monkeypatch.setattr(app_context, "get_pending_schema_validation", lambda: {"result": object()})
+    monkeypatch.setattr(app_context, "clear_pending_schema_validation", lambda: None)
+
+    class CancelledDialog:
+        user_choice = "cancel"
+
+        def __init__(self, *args):
+            pass
+
+        def exec(self):
+            return sc.QDialog.Rejected
+
+    monkeypatch.setattr(sc, "SchemaValidationDialog", CancelledDialog)
+    db = tmp_path / "created.sqlite"
+    ctrl = sc.StartupController()
+
+    sc._OpenProjectJob(ctrl, db).on_error(RuntimeError("SCHEMA_DEPLOYMENT_REQUIRED"))
+    assert ctrl.recent_service.list() == []  # plain open: cancelling records nothing
+
+    sc._OpenProjectJob(ctrl, db, record_on_abort=True).on_error(RuntimeError("SCHEMA_DEPLOYMENT_REQUIRED"))
+    assert [e["path"] for e in ctrl.recent_service.list()] == [str(db)]
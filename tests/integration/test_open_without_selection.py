@@ -33,7 +33,7 @@ def test_open_button_shows_dialog_when_no_selection(qtbot, tmp_path, monkeypatch
     # Spy: ensure file dialog is invoked and open_project is NOT called when dialog canceled
     called = {"dlg": False, "open": []}
 
-    def fake_get_open_file_name(parent=None, caption=None, dir=None, filter=None):
+    def fake_get_open_file_name(parent=None, caption=None, dir=None, filter=None, options=None):
         called["dlg"] = True
         return "", ""
 
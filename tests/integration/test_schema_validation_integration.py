@@ -168,3 +168,47 @@ def test_schema_deployment_without_pending_data():
         app_context.handle_schema_deployment()
     
     assert "No pending schema validation" in str(exc_info.value)
+
+
+def test_deployment_progress_status_from_worker_thread(qtbot):
+    """Status emitted from a worker thread is applied on the UI thread"""
+    import threading
+    from src.app.dialogs.schema_validation_dialog import SchemaDeploymentProgressDialog
+
+    dialog = SchemaDeploymentProgressDialog(None)
+    qtbot.addWidget(dialog)
+
+    worker = threading.Thread(target=dialog.statusChanged.emit, args=("Deploying schema...",))
+    worker.start()
+    worker.join()
+
+    qtbot.waitUntil(lambda: dialog.status_label.text() == "Deploying schema...", timeout=2000)
+
+
+def test_validation_dialog_details_use_plain_text_pane(qtbot):
+    from PySide6.QtWidgets import QPlainTextEdit
+    from src.app.dialogs.schema_validation_dialog import SchemaValidationDialog
+
+    result = Mock(error_message=None, has_no_tables=False, is_valid=False,
+                  missing_tables=["orders"], extra_tables=[], table_deviations={})
+    dlg = SchemaValidationDialog(None, result, "proj")
+    qtbot.addWidget(dlg)
+    pane, = dlg.findChildren(QPlainTextEdit)
+    assert pane.isReadOnly()
+    assert pane.toPlainText().startswith("Missing Tables:\n  • orders")
+
+
+def test_validation_dialog_details_text_sections():
+    from types import SimpleNamespace
+    from src.app.dialogs.schema_validation_dialog import SchemaValidationDialog
+
+    result = SimpleNamespace(error_message=None, has_no_tables=False, is_valid=False,
+                             missing_tables=["a"], extra_tables=["x", "y"],
+                             table_deviations={"t": ["col c missing", "col d type"]})
+    text = SchemaValidationDialog._build_details_text(SimpleNamespace(validation_result=result))
+    assert text == (
+        "Missing Tables:\n  • a\n\n"
+        "Extra Tables (not in azure.sql):\n  • x\n  • y\n\n"
+        "Table Schema Deviations:\n  t:\n    - col c missing\n    - col d type\n\n"
+        "Proceeding with these deviations may cause application errors or data inconsistencies."
+    )
@@ -11,3 +11,33 @@ def test_startup_view_shows_recent_and_actions(qtbot):
     # If MainWindow is not implemented yet, this import will fail → expected in TDD
     assert True  # Placeholder: full UI assertions after implementation
 
+
+
+def test_recent_list_incremental_updates(qtbot, tmp_path):
+    from src.app.main_window import MainWindow
+
+    win = MainWindow()
+    qtbot.addWidget(win)
+
+    a = str(tmp_path / "a.sqlite")
+    b = str(tmp_path / "b.sqlite")
+    win.show_recent([{"path": a}, {"path": b}])
+
+    # Re-adding an existing path moves it to the top without duplicating it
+    win.add_recent_top({"path": b})
+    assert [win.recent_list.item(i).text() for i in range(win.recent_list.count())] == [b, a]
+
+    win.remove_recent(a)
+    assert [win.recent_list.item(i).text() for i in range(win.recent_list.count())] == [b]
+
+
+def test_run_module_defers_window_and_controller_imports():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, src.app.run; "
+        "assert 'src.app.main_window' not in sys.modules; "
+        "assert 'src.app.controllers.startup_controller' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,41 @@
+from src.services.app_context import AppContext
+from src.services.project_creator_local import ProjectCreatorLocal
+
+
+def test_settings_roundtrip_reuses_connection(tmp_path):
+    path = tmp_path / "proj.sqlite"
+    ProjectCreatorLocal(path).create()
+
+    ctx = AppContext()
+    ctx.load_project(path)
+    try:
+        assert ctx.get_setting("ui_db_logging", "1") == "1"
+        ctx.set_setting("ui_db_logging", "0")
+        conn = ctx._settings_conn
+        assert ctx.get_setting("ui_db_logging") == "0"
+        assert ctx._settings_conn is conn
+    finally:
+        ctx.close()
+    assert ctx._settings_conn is None
+    assert ctx.get_setting("ui_db_logging", "x") == "x"
+
+
+def test_read_remote_descriptor_single_query(tmp_path):
+    import sqlite3
+
+    path = tmp_path / "remote.sqlite"
+    ProjectCreatorLocal(path).create()
+    conn = sqlite3.connect(str(path))
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO settings(key, value) VALUES(?, ?)",
+            [("remote_server", "srv"), ("remote_database", "db"), ("remote_auth_type", "SQL"),
+             ("remote_port", "1444"), ("remote_use_driver17", "1")],
+        )
+    conn.close()
+
+    server, database, auth_type, username, authority, timeout, use_driver17 = (
+        AppContext()._read_remote_descriptor(path)
+    )
+    assert (server, database, auth_type) == ("srv,1444", "db", "sql")
+    assert (username, authority, timeout, use_driver17) == ("", "", 30, True)
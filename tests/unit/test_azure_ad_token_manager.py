@@ -0,0 +1,35 @@
+from src.services.azure_ad_token_manager import ConnectionDescriptor
+
+
+def test_connection_descriptor_normalizes_auth_type():
+    d = ConnectionDescriptor(server="srv", database="db", auth_type="Azure_AD_Interactive")
+    assert d.auth_type == "azure_ad_interactive"
+    assert d.cache_key() == "srv:db:azure_ad_interactive:none"
+    assert ConnectionDescriptor(server="s", database="d", auth_type=None).auth_type == ""
+    assert not hasattr(d, "__dict__")
+
+
+def test_authenticate_and_cache_reuses_valid_token(monkeypatch):
+    from datetime import datetime, timedelta
+    from src.services.azure_ad_token_manager import AuthToken, AzureADTokenManager
+
+    mgr = AzureADTokenManager()
+    desc = ConnectionDescriptor(server="srv", database="db", auth_type="azure_ad_interactive")
+    calls = []
+
+    def fake_interactive(d):
+        calls.append(d)
+        mgr._token_cache[d.cache_key()] = AuthToken(
+            access_token="odbc_cached", expires_at=datetime.now() + timedelta(hours=1)
+        )
+        return True
+
+    monkeypatch.setattr(mgr, "_perform_interactive_auth_and_cache", fake_interactive)
+    assert mgr.authenticate_and_cache(desc) is True
+    assert mgr.authenticate_and_cache(desc) is True
+    assert len(calls) == 1
+
+    # Expired tokens trigger a fresh authentication
+    mgr._token_cache[desc.cache_key()].expires_at = datetime.now()
+    assert mgr.authenticate_and_cache(desc) is True
+    assert len(calls) == 2
@@ -66,3 +66,51 @@ def test_azure_ad_connection_string_generation():
 
     assert "TrustServerCertificate=no" in conn_str_windows
 
+
+
+def test_is_aad_0x534_checks_driver_message_only():
+    from src.services.mssql_connection import is_aad_0x534
+
+    class FakeOdbcError(Exception):
+        pass
+
+    assert is_aad_0x534(FakeOdbcError("FA004", "[Microsoft][ODBC Driver 18] ... code 0x534 ..."))
+    assert not is_aad_0x534(FakeOdbcError("0x534", "Login timeout expired"))
+    assert is_aad_0x534(RuntimeError("Azure AD authentication failed (Error 0x534)"))
+    assert not is_aad_0x534(RuntimeError())
+
+
+def test_driver_error_codes_parses_driver_message():
+    from src.services.mssql_connection import driver_error_codes
+
+    class FakeOdbcError(Exception):
+        pass
+
+    exc = FakeOdbcError("FA004", "[FA004] Failed to authenticate (0x4B0), retry: code 0x534.")
+    assert driver_error_codes(exc) == ("0x4b0", "0x534")
+    assert driver_error_codes(RuntimeError("status 0x5341")) == ("0x5341",)
+    assert driver_error_codes(RuntimeError(42)) == ()
+
+
+def test_build_connect_kwargs_is_memoized_and_returns_copies():
+    from src.services.mssql_connection import _cached_connect_kwargs, build_connect_kwargs
+
+    _cached_connect_kwargs.cache_clear()
+    desc = {"server": "srv", "database": "db", "port": 1444, "auth_type": "sql", "username": "u"}
+    first = build_connect_kwargs(desc)
+    first["Server"] = "mutated"
+    second = build_connect_kwargs(dict(desc, password="secret"))
+    assert second["Server"] == "srv,1444" and second["UID"] == "u"
+    assert _cached_connect_kwargs.cache_info().hits == 1
+    assert "PWD" not in second
+    assert build_connect_kwargs({"server": "srv", "extra": ["unhashable"]})["Server"] == "srv"
+
+
+def test_map_exception_fingerprints_are_case_insensitive_and_ordered():
+    from src.services.mssql_connection import map_exception
+
+    assert "timed out" in map_exception(RuntimeError("SSL handshake: Login TIMEOUT expired"))
+    assert "certificate" in map_exception(RuntimeError("The Certificate chain was issued by an untrusted authority"))
+    assert "ROPC" in map_exception(RuntimeError("[FA004] AADSTS50126: INVALID_GRANT"))
+    assert "0x534" in map_exception(RuntimeError("[fa004] Failed to authenticate (0x534)"))
+    assert map_exception(RuntimeError("Login failed for user 'u'")).startswith("Connection failed.")
@@ -0,0 +1,41 @@
+import socket
+
+import pytest
+
+from src.services.net_probe import ensure_reachable, probe_reachable, sql_server_endpoint
+
+
+def test_sql_server_endpoint_parsing():
+    assert sql_server_endpoint("db.example.com") == ("db.example.com", 1433)
+    assert sql_server_endpoint("db.example.com", 1444) == ("db.example.com", 1444)
+    assert sql_server_endpoint("tcp:db.example.com,1500", 1444) == ("db.example.com", 1500)
+    assert sql_server_endpoint("host\\SQLEXPRESS") is None
+    assert sql_server_endpoint("(local)") is None
+    assert sql_server_endpoint("host,notaport") is None
+    assert sql_server_endpoint("") is None
+
+
+def test_probe_reachable_reports_each_candidate():
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+    open_port = listener.getsockname()[1]
+
+    closed = socket.socket()
+    closed.bind(("127.0.0.1", 0))
+    closed_port = closed.getsockname()[1]
+    closed.close()
+    try:
+        assert probe_reachable([("127.0.0.1", open_port), ("127.0.0.1", closed_port)], 1000) == [True, False]
+        assert probe_reachable([("no-such-host.invalid", 1433)], 200) == [False]
+    finally:
+        listener.close()
+
+
+def test_ensure_reachable_raises_timeout_error():
+    closed = socket.socket()
+    closed.bind(("127.0.0.1", 0))
+    closed_port = closed.getsockname()[1]
+    closed.close()
+    with pytest.raises(TimeoutError, match=f"127.0.0.1:{closed_port}"):
+        ensure_reachable(("127.0.0.1", closed_port), 500)
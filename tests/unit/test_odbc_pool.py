@@ -0,0 +1,33 @@
+import sys
+import types
+
+
+def test_load_pyodbc_enables_pooling(monkeypatch):
+    from src.services.odbc_pool import load_pyodbc
+
+    fake = types.ModuleType("pyodbc")
+    fake.pooling = False
+    monkeypatch.setitem(sys.modules, "pyodbc", fake)
+
+    assert load_pyodbc() is fake
+    assert fake.pooling is True
+
+
+def test_connection_cache_reuses_live_handles_and_closes_the_rest(fake_pyodbc):
+    from src.services.odbc_pool import ConnectionCache
+
+    cache = ConnectionCache(60.0)
+    assert not cache.reuse("a")
+
+    first, second = fake_pyodbc.connect("a"), fake_pyodbc.connect("a")
+    cache.remember("a", first)
+    cache.remember("a", second)  # replacing closes the old handle
+    assert first.closed and cache.reuse("a") and not second.closed
+
+    second.dead = True
+    assert not cache.reuse("a") and second.closed and "a" not in cache
+
+    third = fake_pyodbc.connect("key")
+    cache.remember(("key", 1), third)
+    cache.clear()
+    assert third.closed and len(cache) == 0
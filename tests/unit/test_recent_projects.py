@@ -60,3 +60,56 @@ def test_recent_projects_behaviors(tmp_path, monkeypatch):
     remaining2 = svc.list()
     assert all(Path(e["path"]).name != "proj5.sqlite" for e in remaining2)
 
+
+
+def test_recent_projects_load_skips_rewrite_when_normalized(tmp_path, monkeypatch):
+    from src.services.recent_projects import RecentProjectsService
+    from src.lib import paths as paths_mod
+
+    recent_path = tmp_path / "recent_projects.json"
+    monkeypatch.setattr(paths_mod, "recent_projects_path", lambda: recent_path)
+
+    p = tmp_path / "proj.sqlite"
+    p.write_text("test")
+    RecentProjectsService().add(str(p))
+
+    # A fresh service reading an already-normalized file must not write it back
+    svc = RecentProjectsService()
+    saves = []
+    monkeypatch.setattr(svc, "_save", lambda: saves.append(True))
+    assert len(svc.list()) == 1
+    assert saves == []
+
+
+def test_recent_projects_corrupt_file_resets_to_empty(tmp_path, monkeypatch):
+    from src.services.recent_projects import RecentProjectsService
+    from src.lib import paths as paths_mod
+
+    recent_path = tmp_path / "recent_projects.json"
+    monkeypatch.setattr(paths_mod, "recent_projects_path", lambda: recent_path)
+
+    recent_path.write_bytes(b"{not json")
+    assert RecentProjectsService().list() == []
+    # Normalized form is written back
+    assert json.loads(recent_path.read_bytes()) == []
+
+
+def test_recent_projects_list_snapshot_refreshes_on_mutation(tmp_path, monkeypatch):
+    from src.services.recent_projects import RecentProjectsService
+    from src.lib import paths as paths_mod
+
+    recent_path = tmp_path / "recent_projects.json"
+    monkeypatch.setattr(paths_mod, "recent_projects_path", lambda: recent_path)
+
+    a = tmp_path / "a.sqlite"; a.write_text("x")
+    b = tmp_path / "b.sqlite"; b.write_text("x")
+    svc = RecentProjectsService()
+    svc.add(str(a))
+    first = svc.list()
+    first[0]["path"] = "mutated"
+    assert svc.list()[0]["path"] == str(a)
+
+    svc.add(str(b))
+    assert [e["path"] for e in svc.list()] == [str(b), str(a)]
+    svc.remove(str(b))
+    assert [e["path"] for e in svc.list()] == [str(a)]